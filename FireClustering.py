@@ -3,63 +3,195 @@ This module include all functions used for doing fire clustering
 """
 
 
-def remove_self(inds, dist):
-    """ Remove self from the index and distance arrays
+def remove_self(indptr, inds, dist):
+    """ Remove self from the CSR neighbor arrays
 
     Parameters
     ----------
-    inds : np array of np array
+    indptr : np array (n+1)
+        CSR row pointer; neighbors of point i are in indptr[i]:indptr[i+1]
+    inds : np array
         indices of neighbors for each point (self included)
-    dist : np array of np array
+    dist : np array
         distance of neighbors for each point (self included)
 
     Returns
     -------
-    new_inds : np array of np array
+    new_indptr : np array (n+1)
+        CSR row pointer (self excluded)
+    new_inds : np array
         indices of neighbors (self excluded)
-    new_dist : np array of np array
+    new_dist : np array
         distance of neighbors (self excluded)
     """
     import numpy as np
 
-    new_inds = []
-    new_dist = []
-    for i in range(len(inds)):
-        pos = np.where(inds[i] == i)
-        new_inds.append(np.delete(inds[i], pos))
-        new_dist.append(np.delete(dist[i], pos))
+    npts = len(indptr) - 1
+    rows = np.repeat(np.arange(npts), np.diff(indptr))
+    keep = inds != rows
 
-    return np.array(new_inds, dtype=object), np.array(new_dist, dtype=object)
+    new_indptr = np.zeros(npts + 1, dtype=np.int64)
+    new_indptr[1:] = np.cumsum(np.bincount(rows[keep], minlength=npts))
 
+    return new_indptr, inds[keep], dist[keep]
 
-def build_rtree(geoms, fids=False):
-    """Builds Rtree from a shapely multipolygon shape
-    and optionally uses list of fids as identifier"""
+
+def build_rtree(geoms, fids=False, bufs=None):
+    """Builds Rtree from the bounds of shapely geometries
+    and optionally uses list of fids as identifier
+
+    The index is bulk loaded (packed with the STR algorithm) from a stream of
+    the bounds of all geometries. Empty geometries are not indexed. If bufs is
+    given, the bounds of each geometry are expanded by the buffer value (None:
+    no expansion), so buffered geometries are not needed for the index.
+    """
     import rtree
 
-    idx = rtree.index.Index()  # create new index
-    for ind, geom in enumerate(geoms):
-        if fids:
-            idx.insert(ind, geom.bounds, fids[ind])
-        else:
-            idx.insert(ind, geom.bounds, ind)
+    def expand(bounds, buf):
+        if buf is None:
+            return bounds
+        return (bounds[0] - buf, bounds[1] - buf, bounds[2] + buf, bounds[3] + buf)
+
+    items = [
+        (
+            fids[ind] if fids else ind,
+            expand(geom.bounds, None if bufs is None else bufs[ind]),
+            None,
+        )
+        for ind, geom in enumerate(geoms)
+        if not geom.is_empty
+    ]
+    if len(items) == 0:  # the bulk loader does not accept an empty stream
+        return rtree.index.Index()
+    idx = rtree.index.Index(iter(items))
 
     return idx
 
 
+def idx_intersection_bulk(idx, bboxes):
+    """
+    Finds all objects in an index which bounding boxes intersect with each of a list of bounding boxes
+
+    The candidates of each box are sorted by object id (for an index built
+    without fids, the position of the geometry), so callers taking the first
+    match pick the lowest position. The rtree itself returns them in tree
+    layout order.
+
+    Parameters
+    ----------
+    idx : rtree.index.Index
+        the spatial index (created with build_rtree)
+    bboxes : list of tuple
+        bounding boxes (minx, miny, maxx, maxy) to query
+
+    Returns
+    -------
+    iq : np array
+        position of the bounding box in bboxes for each candidate pair
+    fids : np array
+        the object (index or fid) for each candidate pair; sorted within each bounding box
+    """
+    import numpy as np
+
+    hits = [sorted(idx.intersection(tuple(bbox))) for bbox in bboxes]
+    iq = np.repeat(np.arange(len(hits), dtype=np.int64), [len(h) for h in hits])
+    fids = np.fromiter((fid for h in hits for fid in h), dtype=np.int64, count=len(iq))
+    return iq, fids
+
+
 def idx_intersection(idx, bbox):
     """
     Finds all objects in an index whcih bounding boxes intersect with a geometry's bounding box
     """
-    intersections = list(idx.intersection(bbox, objects=True))
-    if len(intersections) > 0:
-        fids, bbox = zip(*[(item.object, item.bbox) for item in intersections])
-    else:
-        fids = []
-    return fids
+    iq, fids = idx_intersection_bulk(idx, [bbox])
+    return tuple(fids.tolist())
+
+
+def grid_query_radius(X, r, Y=None):
+    """ Fixed-radius neighbor search using a uniform grid (spatial hash)
+
+    Points are hashed to square cells of size r, so all neighbors of a query
+    point are found in the 3x3 block of cells around it.
+
+    Parameters
+    ----------
+    X : np array (nx2)
+        projected point locations (m) to be searched
+    r : float
+        search radius (m)
+    Y : np array (mx2)
+        projected query point locations (m); use X if not set
 
+    Returns
+    -------
+    indptr : np array (m+1)
+        CSR row pointer; neighbors of query point i are in indptr[i]:indptr[i+1]
+    indices : np array
+        indices (to X) of neighbors (self included if Y is X)
+    dist : np array
+        distance (m) of neighbors
+    """
+    import numpy as np
 
-def compute_all_spatial_distances(data, max_thresh_km):
+    X = np.asarray(X, dtype=float).reshape(-1, 2)
+    Y = X if Y is None else np.asarray(Y, dtype=float).reshape(-1, 2)
+    nq = len(Y)
+    if (len(X) == 0) or (nq == 0):
+        return np.zeros(nq + 1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    # integer cell coordinates, shifted so that all keys (with offsets) are positive
+    cx = np.floor(X / r).astype(np.int64)
+    cy = np.floor(Y / r).astype(np.int64)
+    cmin = np.minimum(cx.min(axis=0), cy.min(axis=0)) - 1
+    cx -= cmin
+    cy -= cmin
+    ncol = max(cx[:, 1].max(), cy[:, 1].max()) + 2
+
+    # sort the searched points by cell key and record the occupied cells
+    key = cx[:, 0] * ncol + cx[:, 1]
+    order = np.argsort(key, kind="stable")
+    ukey, ustart, ucount = np.unique(key[order], return_index=True, return_counts=True)
+
+    # cells of the query points
+    qkey = cy[:, 0] * ncol + cy[:, 1]
+    uqkey, qinv = np.unique(qkey, return_inverse=True)
+
+    # collect candidate pairs from the 3x3 neighboring cells
+    qis, pjs = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            # look up the occupied cells at this offset (one search per query cell)
+            tkey = uqkey + dx * ncol + dy
+            pos = np.minimum(np.searchsorted(ukey, tkey), len(ukey) - 1)
+            found = ukey[pos] == tkey
+            lo = np.where(found, ustart[pos], 0)[qinv]
+            cnt = np.where(found, ucount[pos], 0)[qinv]
+            ntot = cnt.sum()
+            if ntot == 0:
+                continue
+            qi = np.repeat(np.arange(nq), cnt)
+            pos = np.arange(ntot) - np.repeat(np.cumsum(cnt) - cnt - lo, cnt)
+            qis.append(qi)
+            pjs.append(order[pos])
+    if len(qis) == 0:
+        return np.zeros(nq + 1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    qi = np.concatenate(qis)
+    pj = np.concatenate(pjs)
+
+    # keep pairs within the radius
+    d = np.hypot(X[pj, 0] - Y[qi, 0], X[pj, 1] - Y[qi, 1])
+    keep = d <= r
+    qi, pj, d = qi[keep], pj[keep], d[keep]
+
+    # order by query point
+    srt = np.argsort(qi, kind="stable")
+    indptr = np.zeros(nq + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(qi, minlength=nq))
+
+    return indptr, pj[srt], d[srt]
+
+
+def compute_all_spatial_distances(data, max_thresh_km, method=None):
     """ Derive neighbors (and distances) for each point (with lat/lon)
 
     Parameters
@@ -68,58 +200,76 @@ def compute_all_spatial_distances(data, max_thresh_km):
         point location with 'x' and 'y' columns
     max_thresh_km : float
         maximum distance threshold (km) used for classifying neighbors
+    method : str, 'balltree'|'grid'
+        neighbor search backend; use FireConsts.nbsearch if not set
 
     Returns
     -------
-    inds : np array of np array
+    indptr : np array (n+1)
+        CSR row pointer; neighbors of point i are in indptr[i]:indptr[i+1]
+    inds : np array
         indices of neighbors (self exluded)
-    dist : np array of np array
+    dist : np array
         distance (km) of neighbors (self excluded)
     """
     import numpy as np
-    from sklearn.neighbors import BallTree
+
+    if method is None:
+        from FireConsts import nbsearch
+
+        method = nbsearch
 
     x = data.x.values
     y = data.y.values
 
     X = np.stack([x, y], axis=-1)
 
-    bt = BallTree(X, leaf_size=20)
+    if method == "balltree":
+        from sklearn.neighbors import BallTree
+
+        bt = BallTree(X, leaf_size=20)
 
-    inds, dist = bt.query_radius(X, r=max_thresh_km * 1000, return_distance=True)
-    inds, dist = remove_self(inds, dist)
-    return inds, dist * 1000
+        inds, dist = bt.query_radius(X, r=max_thresh_km * 1000, return_distance=True)
+
+        # flatten the per-point arrays to CSR arrays
+        indptr = np.zeros(len(X) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(i) for i in inds])
+        inds = np.concatenate(inds).astype(np.int64)
+        dist = np.concatenate(dist)
+    elif method == "grid":
+        indptr, inds, dist = grid_query_radius(X, max_thresh_km * 1000)
+    else:
+        raise ValueError(f"unknown neighbor search method {method}")
 
+    indptr, inds, dist = remove_self(indptr, inds, dist)
+    return indptr, inds, dist * 1000
 
-def sort_neighbors(inds, dists):
+
+def sort_neighbors(indptr, inds, dists):
     """ Do neighbor sorting (based on distance) for all points
 
     Parameters
     ----------
-    inds : np array of np array
+    indptr : np array (n+1)
+        CSR row pointer
+    inds : np array
         indices of neighbors (self exluded)
-    dist : np array of np array
+    dist : np array
         distance (km) of neighbors (self excluded)
 
     Returns
     -------
-    sorted_inds : np array of np array
-        indices of neighbors (self exluded)
-    sorted_dists : np array of np array
-        distance (km) of neighbors (self excluded)
+    sorted_inds : np array
+        indices of neighbors (self exluded), sorted by distance within each point
+    sorted_dists : np array
+        distance (km) of neighbors (self excluded), sorted within each point
     """
     import numpy as np
 
-    sorted_inds = []
-    sorted_dists = []
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    new_order = np.lexsort((dists, rows))
 
-    for i in range(len(inds)):
-        new_order = np.argsort(dists[i])
-
-        sorted_inds.append(inds[i][new_order])
-        sorted_dists.append(dists[i][new_order])
-
-    return sorted_inds, sorted_dists
+    return inds[new_order], dists[new_order]
 
 
 def do_clustering(data, max_thresh_km):
@@ -137,12 +287,8 @@ def do_clustering(data, max_thresh_km):
     point_to_cluster_id : list
         cluster id for each fire point
     """
-    import numpy as np
     import pandas as pd
 
-    # value to fill in pixels without clustering
-    NO_CLUSTER_VAL = -1
-
     # if number of points is 1 or 2, each point is one cluster
     num_points = len(data)
     if num_points < 3:
@@ -152,51 +298,57 @@ def do_clustering(data, max_thresh_km):
     # convert list to pd DataFrame
     dfdata = pd.DataFrame(data, columns=["x", "y"])
 
-    # initialization
-    cluster_id_counter = 0
-    point_to_cluster_id = np.full(num_points, fill_value=NO_CLUSTER_VAL, dtype=np.int64)
-
     # compute and sort neighbor pixels for each pixel
-    neighbor_inds, neighbor_spatial_dists = compute_all_spatial_distances(
+    neighbor_indptr, neighbor_inds, neighbor_spatial_dists = compute_all_spatial_distances(
         dfdata, max_thresh_km
     )
-    # neighbor_inds, neighbor_spatial_dists = sort_neighbors(neighbor_inds, neighbor_spatial_dists)
-
-    # include all possible pixels in cluster
-    to_check = np.full(num_points, fill_value=1, dtype=np.int8)
-    while np.sum(to_check) > 0:
-        start_ind = np.argmax(to_check == 1)  # catch first index to check
-
-        neighbors_to_search = list(neighbor_inds[start_ind])
-        all_neighbors = neighbors_to_search
-
-        if (
-            len(all_neighbors) == 0
-        ):  # if no neighbor, record the current pixel as a separate cluster
-            point_to_cluster_id[start_ind] = cluster_id_counter
-            cluster_id_counter += 1
-            to_check[start_ind] = 0
-
-        else:  # if with neighbor, record all neighbors
-            # find all neighbours of neighbours:
-            searched_neighbours = [start_ind]
-            while len(neighbors_to_search) > 0:
-                # take the first of these
-                px = neighbors_to_search[0]
-                searched_neighbours.append(px)
-                px_neighbors = list(neighbor_inds[px])
-                all_neighbors = list(set(all_neighbors + px_neighbors))
-                neighbors_to_search = list(
-                    set(all_neighbors).difference(searched_neighbours)
-                )
-            # now we have all pixels in this cluster in all_neighbors
-            point_to_cluster_id[all_neighbors] = cluster_id_counter
-            cluster_id_counter += 1
-            to_check[all_neighbors] = 0
+    # neighbor_inds, neighbor_spatial_dists = sort_neighbors(neighbor_indptr, neighbor_inds, neighbor_spatial_dists)
+
+    # label all connected pixels using a sparse neighbor graph
+    point_to_cluster_id = label_components(neighbor_indptr, neighbor_inds)
 
     return point_to_cluster_id.tolist()
 
 
+def label_components(indptr, inds):
+    """ Label connected components of the neighbor graph
+
+    Parameters
+    ----------
+    indptr : np array (n+1)
+        CSR row pointer; neighbors of point i are in indptr[i]:indptr[i+1]
+    inds : np array
+        indices of neighbors
+
+    Returns
+    -------
+    labels : np array
+        cluster id for each point; clusters are numbered in the order of
+        their first (lowest index) point
+    """
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    # the CSR neighbor arrays are the sparse adjacency matrix
+    num_points = len(indptr) - 1
+    graph = csr_matrix(
+        (np.ones(len(inds), dtype=np.int8), inds, indptr),
+        shape=(num_points, num_points),
+    )
+
+    # label the clusters in one pass
+    ncomp, labels = connected_components(graph, directed=False)
+
+    # renumber clusters by their first point
+    _, first = np.unique(labels, return_index=True)
+    order = np.argsort(first)
+    newid = np.empty(ncomp, dtype=np.int64)
+    newid[order] = np.arange(ncomp)
+
+    return newid[labels]
+
+
 def cal_distance(loc1, loc2):
     """ Calculate the distance between two points
 
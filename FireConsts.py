@@ -30,6 +30,9 @@ diroutdata = 's3://maap-ops-workspace/shared/gsfc_landslides/FEDSoutput-s3-conus
 # spatial parameters used for fire pixel clustering
 EARTH_RADIUS_KM = 6371.0  # earth radius, km
 
+# neighbor search used for fire pixel clustering ('balltree' | 'grid')
+nbsearch = "balltree"
+
 # temporal parameters for fire object definition
 maxoffdays = 5  # fire becomes inactive after this number of consecutive days without active fire detection
 limoffdays = 20  # fire keeps sleeper status even at inactive but with inactive dates smaller than this value
@@ -38,6 +41,11 @@ limoffdays = 20  # fire keeps sleeper status even at inactive but with inactive
 expand_only = (
     False  # if set to true, only expand existing fires (no new fire objects created)
 )
+opt_pixidx = False  # if set to true, connect new pixels to nearby exterior pixels of existing fires instead of testing connecting ranges (pixel index; faster but approximate, changes tracking results)
+opt_rngdist = False  # if set to true, test fire connecting ranges using hull distance instead of buffered hulls
+#   (not identical: the buffer rounds hull corners with chords, so a pixel hull just outside a
+#    buffered corner but within the connecting distance is connected only with opt_rngdist)
+opt_coldstore = False  # if set to true, move dead fires from the Allfires object to on-disk files (loaded when needed)
 
 # ------------------------------------------------------------------------------
 # shape parameters
@@ -57,6 +65,16 @@ flbuffer = (
 extbuffer = 1000  # buffer to define interior/exterior region, 1000 m
 area_VI = 0.141  # km2, area of each 375m VIIRS pixel
 
+# hull calculation
+hullpool_minpix = 1000  # clusters with at least this number of pixels are sent to the process pool
+hullpool_nproc = 1  # number of processes used for hulls of large clusters (1: no process pool)
+opt_hullbudget = False  # if set to true, snap and simplify fire hulls after each update (bounded complexity)
+hull_maxvertices = 5000  # vertex budget of a fire hull (used if opt_hullbudget is true)
+hull_gridsize = 1.0  # precision grid (m) hull coordinates are snapped to (used if opt_hullbudget is true)
+opt_rasterhull = False  # if set to true, use burned-cell bitmaps for the hulls of very large fires
+rasterhull_minpix = 20000  # fires/clusters with at least this number of pixels use the bitmap hull
+rasterhull_res = 375  # bitmap cell size (m)
+
 # MODIS pixel size
 MCD64buf = 231.7  # MODIS fire perimeter buffer (deg), corresponding to 463.31271653 m/2
 
@@ -106,7 +106,8 @@ def set_ftype(fire):
             uselocs = fire.newlocs_geo
         else:
             # we can do a random sample of 1000 new pixels (it's likely going to be a forest fire anyways)
-            uselocs = random.sample(fire.newlocs_geo, 1000)
+            newlocs_geo = fire.newlocs_geo
+            uselocs = newlocs_geo[random.sample(range(len(newlocs_geo)), 1000)]
 
         vLCT = FireIO.get_LCT_CONUS(
             uselocs
@@ -153,7 +154,8 @@ def set_ftype(fire):
             uselocs = fire.newlocs_geo
         else:
             # we can do a random sample of 1000 new pixels (it's likely going to be a forest fire anyways)
-            uselocs = random.sample(fire.newlocs_geo, 1000)
+            newlocs_geo = fire.newlocs_geo
+            uselocs = newlocs_geo[random.sample(range(len(newlocs_geo)), 1000)]
         
         vLCT = FireIO.get_LCT_Global(
             uselocs
@@ -38,6 +38,7 @@ def make_gdf_snapshot(allfires, regnm, layer="perimeter"):
         the gdf containing half daily fire basic attributes and fire perimeter
     """
     import geopandas as gpd
+    import pandas as pd
 
     # from FireConsts import dd
     import FireIO, FireObj, FireTime
@@ -124,50 +125,45 @@ def make_gdf_snapshot(allfires, regnm, layer="perimeter"):
 
     # 2. modify dd2 for fires with possible modification
 
-    # - for mayactive fires (active+sleeper), copy attributes from fire object to gdf
-    for fid, f in allfires.mayactivefires.items():  # loop over active fires
-        for k, tp in dd2.items():
-            if tp == "datetime64":
-                gdf.loc[fid, k] = FireTime.t2dt(getattr(f, k))
-            else:
-                gdf.loc[fid, k] = getattr(f, k)
+    # - for mayactive fires (active+sleeper), copy attributes from fire objects to gdf
+    #   (rows are added for fires not in gdf yet)
+    fids_ma = list(allfires.mayactivefires)
+    fids_add = [fid for fid in fids_ma + list(allfires.fires) if fid not in gdf.index]
+    fids_add = list(dict.fromkeys(fids_add))  # unique ids, in order
+    if len(fids_add) > 0:
+        gdf = gdf.reindex(pd.Index(list(gdf.index) + fids_add, name="fireID"))
+    df = allfires.to_frame(fids_ma, dd2, hull=(layer == "perimeter"))
+    for k in dd2:
+        gdf.loc[fids_ma, k] = df[k].values
 
     # update the hull of each active fire as the geometry column
     if layer == "perimeter":
-        for fid, f in allfires.mayactivefires.items():
-            fhull = f.hull
-            if fhull.geom_type == "MultiPolygon":
-                gdf.loc[fid, "geometry"] = gpd.GeoDataFrame(
-                    geometry=[fhull]
-                ).geometry.values
-            else:
-                gdf.loc[fid, "geometry"] = fhull
+        gdf.loc[fids_ma, "geometry"] = df.geometry.values
 
     elif layer == "fireline":
-        for fid, f in allfires.activefires.items():  # loop over active fires
-            fline = f.fline
-            if fline is not None:
-                if fline.geom_type == "MultiLineString":
-                    gdf.loc[fid, "geometry"] = gpd.GeoDataFrame(
-                        geometry=[fline]
-                    ).geometry.values
-                else:
-                    gdf.loc[fid, "geometry"] = fline
+        flines = {fid: f.fline for fid, f in allfires.activefires.items()}
+        flines = {fid: fline for fid, fline in flines.items() if fline is not None}
+        if len(flines) > 0:
+            gdf.loc[list(flines), "geometry"] = gpd.GeoSeries(
+                list(flines.values()), index=list(flines)
+            ).values
 
     elif layer == "newfirepix":
-        for fid, f in allfires.activefires.items():  # loop over active fires
-            if f.n_newpixels > 0:
-                gdf.loc[fid, "geometry"] = gpd.GeoDataFrame(
-                    geometry=[f.newlocsMP]
-                ).geometry.values
+        nfps = {
+            fid: f.newlocsMP
+            for fid, f in allfires.activefires.items()
+            if f.n_newpixels > 0
+        }
+        if len(nfps) > 0:
+            gdf.loc[list(nfps), "geometry"] = gpd.GeoSeries(
+                list(nfps.values()), index=list(nfps)
+            ).values
 
     # 3. modify dd1 for all fires
-    for fid, f in allfires.fires.items():  # loop over all fires
-        for k, tp in dd1.items():
-            if tp == "datetime64":
-                gdf.loc[fid, k] = FireTime.t2dt(getattr(f, k))
-            else:
-                gdf.loc[fid, k] = getattr(f, k)
+    fids = list(allfires.fires)
+    df = allfires.to_frame(fids, dd1)
+    for k in dd1:
+        gdf.loc[fids, k] = df[k].values
 
     # 4. force the correct dtypes
     for k, tp in dd.items():
@@ -235,9 +231,7 @@ def save_gdf_trng(tst, ted, regnm):
 def save_gdf_uptonow(t, regnm):
     """ Create and save all valid fires (active, sleeper, and dead) up to now
     """
-    import FireIO, FireTime
-    import geopandas as gpd
-    from FireConsts import epsg
+    import FireIO
 
     # read allfires object
     allfires = FireIO.load_fobj(t, regnm, activeonly=False)
@@ -260,27 +254,8 @@ def save_gdf_uptonow(t, regnm):
         "t_st": "datetime64",
         "t_ed": "datetime64",
     }
-    gdf = gpd.GeoDataFrame(
-        columns=(list(dd.keys()) + ["fireID"]), crs="epsg:" + str(epsg), geometry=[]
-    )
-    gdf = gdf.set_index("fireID")
-
-    # loop over valid fires
-    for fid, f in allfires.validfires.items():
-        # assign attributes
-        for k, tp in dd.items():
-            if tp == "datetime64":
-                gdf.loc[fid, k] = FireTime.t2dt(getattr(f, k))
-            else:
-                gdf.loc[fid, k] = getattr(f, k)
-        # assign geometry
-        fhull = f.hull
-        if fhull.geom_type == "MultiPolygon":
-            gdf.loc[fid, "geometry"] = gpd.GeoDataFrame(
-                geometry=[fhull]
-            ).geometry.values
-        else:
-            gdf.loc[fid, "geometry"] = fhull
+    # extract attributes and hulls of valid fires
+    gdf = allfires.to_frame(allfires.fids_valid, dd, hull=True)
 
     # make sure the data types are correct
     for k, tp in dd.items():
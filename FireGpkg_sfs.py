@@ -81,11 +81,9 @@ def find_largefires(allfires, falim=4):
     large_ids : list
         the list of large fire IDs
     """
-    large_ids = [
-        fid
-        for fid in (allfires.fids_active + allfires.fids_sleeper)
-        if allfires.fires[fid].farea > falim
-    ]
+    fids = allfires.fids_active + allfires.fids_sleeper
+    df = allfires.to_frame(fids, ["farea"])
+    large_ids = list(df.index[df.farea > falim])
     return large_ids
 
 
@@ -108,13 +106,12 @@ def find_mergefires_ct(allfires, fid):
     # fids_m = list(sorted([h[0] for h in allfires.heritages if
     #             ((allfires.fires[h[0]].t_ed == t) & (allfires.fires[h[0]].t_st != t)
     #              & (h[1] == fid))]))
+    fids = set(allfires.fids)
+    fids_h = [h[0] for h in allfires.heritages if (h[1] == fid) and (h[0] in fids)]
     fids_m = []
-    for h in allfires.heritages:
-        if h[1] == fid:
-            if h[0] in allfires.fids:
-                f_m = allfires.fires[h[0]]
-                if (f_m.t_ed == t) & (f_m.t_st != t):
-                    fids_m.append(h[0])
+    for fid_h, f_m in zip(fids_h, allfires.getfires(fids_h)):
+        if (f_m.t_ed == t) & (f_m.t_st != t):
+            fids_m.append(fid_h)
     fids_m = list(sorted(fids_m))
     return fids_m
 
@@ -260,32 +257,25 @@ def make_sf_nfplist(allfires, t, regnm, fids):
         allfires = FireIO.load_fobj(t, regnm, activeonly=False)
     # record all nfps for all fires with fids to make nfplist at t
     gdf_1d = None
-    for fid in fids:
-        if fid in allfires.fids_valid:   # only record newpixels for valid fires
-            f = allfires.fires[fid]
-            plist = []
-            for p in f.newpixels:
-                p_attrs = []
-                for k in sfkeys:
-                    p_attrs.append(getattr(p, k))
-                plist.append(p_attrs)
-
-            if len(plist) > 0:
-                df = pd.DataFrame(plist)
-                df.columns = sfkeys
-                gdf_1f = gpd.GeoDataFrame(
-                    df,
-                    crs="epsg:" + str(epsg),
-                    geometry=gpd.points_from_xy(df.x, df.y),
-                )
-
-                # also add t variable (detection 12-hourly time step)
-                gdf_1f['t'] = FireTime.t2dt(t)
-
-                if gdf_1d is None:
-                    gdf_1d = gdf_1f
-                else:
-                    gdf_1d = gdf_1d.append(gdf_1f)
+    fids_valid = set(allfires.fids_valid)
+    fids = [fid for fid in fids if fid in fids_valid]  # only record newpixels for valid fires
+    for fid, f in zip(fids, allfires.getfires(fids)):
+        nps = f.newpixels
+        if len(nps) > 0:
+            df = pd.DataFrame({k: getattr(nps, k) for k in sfkeys})
+            gdf_1f = gpd.GeoDataFrame(
+                df,
+                crs="epsg:" + str(epsg),
+                geometry=gpd.points_from_xy(df.x, df.y),
+            )
+
+            # also add t variable (detection 12-hourly time step)
+            gdf_1f['t'] = FireTime.t2dt(t)
+
+            if gdf_1d is None:
+                gdf_1d = gdf_1f
+            else:
+                gdf_1d = gdf_1d.append(gdf_1f)
     del allfires
     return gdf_1d
 
@@ -362,7 +352,7 @@ def update_sfts_1f(allfires, allfires_pt, fid, regnm, layer="perimeter"):
     import geopandas as gpd
 
     # the target single large fire and target time
-    f = allfires.fires[fid]
+    f = allfires.getfire(fid)
     t = allfires.t
 
     dd = getdd(layer)
@@ -393,7 +383,7 @@ def update_sfts_1f(allfires, allfires_pt, fid, regnm, layer="perimeter"):
         for fid_m in fids_m:
             # create historical time series of all newly merged fires at t_pt
             # using the same approach as the case of gdf_sf_pt==None
-            f_pt = allfires_pt.fires[fid_m]
+            f_pt = allfires_pt.getfire(fid_m)
             fids_mm = list(sorted([h[0] for h in allfires_pt.heritages if h[1] == fid_m]))
             gdf_all_m = make_sfts_1f(allfires_pt,f_pt, fid_m, fids_mm, regnm, layer=layer)
 
@@ -491,7 +481,7 @@ def save_sfts_1f(allfires, allfires_pt, fid, regnm, layers=["perimeter", "fireli
 
     logger.info(f'Generating LF data for fid {fid}')
     tstart = time.time()
-    f = allfires.fires[fid]
+    f = allfires.getfire(fid)
     
     if "perimeter" in layers:
         
@@ -1284,6 +1284,7 @@ def save_fobj(allfires, t, regnm, activeonly=False):
         the flag to save activeonly or full pickle file
     """
 
+    import copy
     import pickle
     import os
     import fsspec
@@ -1300,13 +1301,18 @@ def save_fobj(allfires, t, regnm, activeonly=False):
         allfires_index = 0
         for fid in fids_out:
             # allfires_out.fires.append(allfires.fires[fid])
-            allfires_out.fires[fid] = allfires.fires[fid]
+            allfires_out.fires[fid] = copy.copy(allfires.fires[fid])
             id_dict.append((allfires_index, fid))
             allfires_index += 1
 
         # copy the heritage from the original allfires object
         allfires_out.heritages = allfires.heritages
         allfires_out.id_dict = id_dict
+
+        # keep only the pixel table rows of the saved fires (the copied fire
+        #   objects are pointed to the compacted table; the originals are unchanged)
+        allfires_out.pixtab = allfires.pixtab
+        allfires_out.pixtab = allfires_out._movepixels(allfires_out.fires.values())
     else:
         allfires_out = allfires
 
@@ -1343,6 +1349,8 @@ def load_fobj(t, regnm, activeonly=False):
     # load data
     with fsspec.open(fnm, "rb") as f:
         data = pickle.load(f)
+    if not hasattr(data, "pixtab"):  # objects saved with lists of FirePixel objects
+        data.build_pixtab()
     return data
 
 
@@ -1377,6 +1385,85 @@ def load_fobj(t, regnm, activeonly=False):
 #         pickle.dump(allfires_ia, f)
 
 
+def get_coldfires_fnm(t, regnm):
+    """ Return the file name of dead fires moved out of the allfires object at a time step
+    Parameters
+    ----------
+    t : tuple, (year,month,day,str)
+        the day and 'AM'|'PM' of the time step
+
+    Returns
+    ----------
+    fnm : str
+        pickle file name
+    """
+    from FireConsts import diroutdata
+    from datetime import date
+    import os
+
+    d = date(*t[:-1])
+    fnm = os.path.join(
+        diroutdata,
+        regnm,
+        d.strftime("%Y"),
+        "Serialization",
+        "Cold",
+        d.strftime("%Y%m%d") + t[-1] + "_cold.pkl",
+    )
+    return fnm
+
+
+def save_coldfires(fires, t, regnm):
+    """ Save dead fires moved out of the allfires object to a pickle file
+
+    Parameters
+    ----------
+    fires : dict
+        the fire objects, {fid: Fire}
+    t : tuple, (year,month,day,str)
+        the day and 'AM'|'PM' of the time step
+
+    Returns
+    ----------
+    fnm : str
+        pickle file name
+    """
+    import pickle
+    import fsspec
+
+    # get output file name
+    fnm = get_coldfires_fnm(t, regnm)
+
+    # check folder
+    check_filefolder(fnm)
+
+    # save
+    with fsspec.open(fnm, "wb") as f:
+        pickle.dump(fires, f)
+    return fnm
+
+
+def load_coldfires(fnm):
+    """ Load dead fires moved out of the allfires object from a pickle file
+
+    Parameters
+    ----------
+    fnm : str
+        pickle file name
+
+    Returns
+    ----------
+    fires : dict
+        the fire objects, {fid: Fire}
+    """
+    import pickle
+    import fsspec
+
+    with fsspec.open(fnm, "rb") as f:
+        fires = pickle.load(f)
+    return fires
+
+
 def get_gdfobj_fnm(t, regnm, op=""):
     """ Return the fire object gpkg file name at a time step
     Parameters
@@ -69,7 +69,7 @@ def correct_nested_ids(mergetuple):
     return mergetuple
 
 
-def set_eafirerngs(allfires, fids):
+def set_eafirerngs(allfires, fids, prep=False):
     """ Return a list of fire connecting ranges from a list of fire ids
         fire connecting range is the hull plus a buffer (connectivity_fire)
     Parameters
@@ -78,25 +78,27 @@ def set_eafirerngs(allfires, fids):
         the input allfires object
     fids : list
         the list of fire ids
+    prep : bool
+        if set to true, return prepared geometries of the ranges
 
     Returns
     -------
     eafirerngs : list
         the list of fire connecting ranges corresponding to the sequence of fids
     """
-    import FireFuncs, FireVector
+    import FireFuncs
 
-    # extract existing active fire data (use extending ranges)
+    # extract existing active fire data (use extending ranges, cached on fires)
     firerngs = []
     for fid in fids:
         f = allfires.fires[fid]  # fire
         CONNECTIVITY_FIRE_KM = FireFuncs.get_CONNECTIVITY_FIRE(f)
-        rng = FireVector.addbuffer(f.hull, CONNECTIVITY_FIRE_KM * 1000)
+        rng = f.connrng(CONNECTIVITY_FIRE_KM * 1000, prep=prep)
         firerngs.append(rng)
     return firerngs
 
 
-def set_sleeperrngs(allfires, fids):
+def set_sleeperrngs(allfires, fids, prep=False):
     """ Return a list of fire connecting ranges from a list of fire ids
         fire connecting range is the hull plus a buffer (connectivity_sleeper)
     Parameters
@@ -105,24 +107,55 @@ def set_sleeperrngs(allfires, fids):
         the input allfires object
     fids : list
         the list of fire ids
+    prep : bool
+        if set to true, return prepared geometries of the ranges
 
     Returns
     -------
     eafirerngs : list
         the list of fire connecting ranges corresponding to the sequence of fids
     """
-    import FireFuncs, FireVector
+    import FireFuncs
 
-    # extract existing active fire data (use extending ranges)
+    # extract existing active fire data (use extending ranges, cached on fires)
     sleeperrngs = []
     for fid in fids:
         f = allfires.fires[fid]  # fire
         CONNECTIVITY_SLEEPER_KM = FireFuncs.get_CONNECTIVITY_SLEEPER()
-        rng = FireVector.addbuffer(f.hull, CONNECTIVITY_SLEEPER_KM * 1000)
+        rng = f.connrng(CONNECTIVITY_SLEEPER_KM * 1000, prep=prep)
         sleeperrngs.append(rng)
     return sleeperrngs
 
 
+def set_rngdists(allfires, fids, sleeper=False):
+    """ Return a list of fire connecting distances (m) from a list of fire ids
+        (used instead of buffered connecting ranges if opt_rngdist is set)
+    Parameters
+    ----------
+    allfires : Allfires object
+        the input allfires object
+    fids : list
+        the list of fire ids
+    sleeper : bool
+        if set to true, use connectivity_sleeper instead of connectivity_fire
+
+    Returns
+    -------
+    rngdists : list
+        the list of connecting distances corresponding to the sequence of fids
+    """
+    import FireFuncs
+
+    rngdists = []
+    for fid in fids:
+        if sleeper:
+            CONNECTIVITY_KM = FireFuncs.get_CONNECTIVITY_SLEEPER()
+        else:
+            CONNECTIVITY_KM = FireFuncs.get_CONNECTIVITY_FIRE(allfires.fires[fid])
+        rngdists.append(CONNECTIVITY_KM * 1000)
+    return rngdists
+
+
 def Fobj_init(tst, regnm, restart=False):
     """ Initialize the fire object for a given time. This can be from the object
     saved at previous time, or can be initialized using Allfires().
@@ -140,10 +173,13 @@ def Fobj_init(tst, regnm, restart=False):
         the fire object for the previous time step
     """
     import FireObj, FireIO, FireTime
+    from FireConsts import opt_pixidx
 
     pst = FireTime.t_nb(tst, nb="previous")  # previous time step
     if FireIO.check_fobj(pst, regnm, activeonly=False) & (restart == False):
         allfires = FireIO.load_fobj(pst, regnm, activeonly=False) # load all fires (including dead)
+        if opt_pixidx:  # the saved pixel index may be missing or not up to date
+            allfires.build_pixidx()
         allfires.cleanup(tst)  # update time and reset lists
         # # if it's the first time step of a calendar year, reset all fires id
         # if (tst[1]==1 & tst[2]==1 & tst[3]=='AM'):
@@ -220,7 +256,8 @@ def Fire_expand_rtree(allfires, afp, fids_ea, log=True):
     """
     # import time
     import FireObj, FireClustering, FireVector, FireFuncs
-    from FireConsts import expand_only, firessr
+    from FireConsts import expand_only, firessr, opt_pixidx, opt_rngdist
+    import numpy as np
 
     # initializations
     idmax = (
@@ -230,13 +267,21 @@ def Fire_expand_rtree(allfires, afp, fids_ea, log=True):
     fids_new = []  # a list of fire ids that is created at t
 
     # derive fire connecting ranges of existing active fires (fids_ea)
-    eafirerngs = set_eafirerngs(allfires, fids_ea)
+    #   (if opt_rngdist, use the hulls and connecting distances instead of buffered hulls)
+    if opt_rngdist:
+        eafirerngs = [allfires.fires[fid].hull for fid in fids_ea]
+        eafiredists = set_rngdists(allfires, fids_ea)
+        eafirepreps = eafirerngs
+    else:
+        eafirerngs = set_eafirerngs(allfires, fids_ea)
+        eafiredists = [None] * len(fids_ea)
+        eafirepreps = set_eafirerngs(allfires, fids_ea, prep=True)  # for intersection tests
 
     # create a spatial index based on geometry bounds of fire connecting ranges
-    ea_idx = FireClustering.build_rtree(eafirerngs)
+    ea_idx = FireClustering.build_rtree(eafirerngs, bufs=eafiredists)
 
     # do preliminary clustering using new active fire locations (assign cid to each pixel)
-    afp_loc = list(zip(afp.x, afp.y))
+    afp_loc = np.column_stack([afp.x.values, afp.y.values])
     CONNECTIVITY_CLUSTER = FireFuncs.get_CONNECTIVITY_CLUSTER()
     cid = FireClustering.do_clustering(
         afp_loc, CONNECTIVITY_CLUSTER
@@ -244,64 +289,88 @@ def Fire_expand_rtree(allfires, afp, fids_ea, log=True):
     if log:
         logger.info(f"New fire clusters of {max(cid)} at this time step")
 
-    # loop over all new clusters (0:cid-1) and determine its fate
-    FP2expand = {}  # a diction to record {fid : Firepixel objects} pairs
+    # use the pixel index to find clusters with pixels close to exterior pixels
+    #   of existing active fires (the smallest connected fire id for each cluster;
+    #   these clusters skip the hull and connecting range tests below)
+    cfids_pix = np.full(max(cid) + 1, -1, dtype=np.int64)
+    if opt_pixidx:
+        fidrngs = {
+            fid: FireFuncs.get_CONNECTIVITY_FIRE(allfires.fires[fid]) * 1000
+            for fid in fids_ea
+        }
+        pixfids = allfires.pixidx.query(afp_loc, fidrngs)  # connected fire id of each pixel
+        matched = pixfids >= 0
+        big = np.iinfo(np.int64).max
+        cfids_pix[:] = big
+        np.minimum.at(cfids_pix, np.asarray(cid)[matched], pixfids[matched])
+        cfids_pix[cfids_pix == big] = -1
+
+    # add the new active fire pixels to the pixel table, grouped by cluster id
+    #   (in the original pixel order within each cluster)
+    cidsort = np.argsort(cid, kind="stable")
+    cidbnds = np.searchsorted(np.asarray(cid)[cidsort], np.arange(max(cid) + 2))
+    newpix = allfires.pixtab.append_afp(afp.iloc[cidsort], allfires.t)
+
+    # create cluster objects using all newly detected active fires within each cluster
+    #   (each cluster is a contiguous range of rows in the pixel table)
+    clusters = []
     for ic in range(max(cid) + 1):
-        # create cluster object using all newly detected active fires within a cluster
-        #   (-1 means no source fireid)
-        pixels = [
-            FireObj.FirePixel(
-                afp.iloc[i].x,
-                afp.iloc[i].y,
-                afp.iloc[i].Lon,
-                afp.iloc[i].Lat,
-                afp.iloc[i].FRP,
-                afp.iloc[i].DS,
-                afp.iloc[i].DT,
-                afp.iloc[i].ampm,
-                afp.iloc[i].YYYYMMDD_HHMM,
-                afp.iloc[i].Sat,
-                -1,
-            )
-            for i, v in enumerate(cid)
-            if v == ic
-        ]  # pixels
+        pixels = newpix[cidbnds[ic] : cidbnds[ic + 1]]  # pixels
         cluster = FireObj.Cluster(
             ic, pixels, allfires.t, sensor=firessr
         )  # form cluster
-        hull = cluster.hull  # save hull to reduce computational cost
+        clusters.append(cluster)
+
+    # for clusters not connected through the pixel index, calculate the hulls and
+    #   find potential neighbours of all clusters at once using the spatial index
+    ics_hull = np.flatnonzero(cfids_pix < 0)
+    hulls = FireVector.cal_hulls_batch(
+        [clusters[ic].locs for ic in ics_hull], sensor=firessr
+    )
+    for ic, hull in zip(ics_hull, hulls):
+        clusters[ic].hull = hull  # save hull to reduce computational cost
+    iq, id_cf_all = FireClustering.idx_intersection_bulk(
+        ea_idx, [clusters[ic].b_box for ic in ics_hull]
+    )
+
+    # assign each of these clusters to the first candidate fire (in fids_ea order) whose
+    #   connecting range it touches; round k tests the k-th candidate of all clusters
+    #   still unassigned in one call, so a cluster stops at its first matching fire
+    cfids = cfids_pix.copy()  # connected fire id for each cluster (-1: none)
+    fids_ea_arr = np.asarray(fids_ea, dtype=np.int64)
+    rank = np.arange(len(iq)) - np.searchsorted(iq, iq)  # candidate order in each cluster
+    for k in range(rank.max() + 1 if len(rank) > 0 else 0):
+        sel = np.flatnonzero(rank == k)
+        sel = sel[cfids[ics_hull[iq[sel]]] < 0]
+        if len(sel) == 0:
+            break
+        ics, id_cfs = ics_hull[iq[sel]], id_cf_all[sel]
+        hit = FireVector.rng_intersects_bulk(
+            [eafirepreps[id_cf] for id_cf in id_cfs],
+            [clusters[ic].hull for ic in ics],
+            [eafiredists[id_cf] for id_cf in id_cfs],
+        )  # determine if clusters touch fire connecting ranges
+        cfids[ics[hit]] = fids_ea_arr[id_cfs[hit]]
+
+    # loop over all new clusters (0:cid-1) and determine its fate
+    FP2expand = {}  # a diction to record {fid : Firepixel objects} pairs
+    for ic, cluster in enumerate(clusters):
+        pixels = cluster.pixels
 
-        # if the cluster is close enough to an existing active fire object
-        #   record all pixels to be added to the existing object (no actuall changes on existing fire objects)
-        id_cfs = FireClustering.idx_intersection(
-            ea_idx, cluster.b_box
-        )  # potential neighbours using spatial index
+        # if the cluster is connected to an existing active fire (through the pixel index
+        #   or its connecting range), record all pixels to be added to the existing object
+        #   (no actuall changes on existing fire objects)
         clusterdone = False
-        for id_cf in id_cfs:  # loop over all potential eafires
+        if cfids[ic] >= 0:
+            fmid = int(cfids[ic])  # this is the fire id of the existing active fire
             if (
-                clusterdone == False
-            ):  # one cluster can only be appended to one existing object
-                if eafirerngs[id_cf].intersects(
-                    hull
-                ):  # determine if cluster touch fire connecting range
-                    # record existing target fire id in fid_expand list
-                    fmid = fids_ea[
-                        id_cf
-                    ]  # this is the fire id of the existing active fire
-                    # record pixels from target cluster (locs and time) along with the existing active fire object id
-                    # newFPs = [FireObj.FirePixel(p.x,p.y,p.lon,p.lat,p.frp,p.DS,p.DT,p.ampm,p.datetime,p.sat,fmid) for p in pixels] # new FirePixels from the cluster
-                    if (
-                        fmid in FP2expand.keys()
-                    ):  # single existing object, can have multiple new clusters to append
-                        FP2expand[fmid] = FP2expand[fmid] + pixels  # newFPs
-                    else:
-                        FP2expand[fmid] = pixels  # newFPs
-                    fids_expanded.append(
-                        fmid
-                    )  # record fmid to fid_expanded ? is this same as list(FP2expand.keys)?
-                    clusterdone = (
-                        True  # mark the cluster as done (no need to create new Fobj)
-                    )
+                fmid in FP2expand.keys()
+            ):  # single existing object, can have multiple new clusters to append
+                FP2expand[fmid] = FP2expand[fmid] + pixels
+            else:
+                FP2expand[fmid] = pixels
+            fids_expanded.append(fmid)
+            clusterdone = True  # mark the cluster as done (no need to create new Fobj)
 
         # if this cluster can't be appended to any existing Fobj, create a new fire object using the new cluster
         if not expand_only:  # ignore creating new fires if expand_only is set to True
@@ -313,11 +382,16 @@ def Fire_expand_rtree(allfires, afp, fids_ea, log=True):
                 fids_new.append(id_newfire)  # record id_newfire to fid_new
 
                 # use the fire id and new fire pixels to create a new Fire object
-                newfire = FireObj.Fire(id_newfire, allfires.t, pixels, sensor=firessr)
+                newfire = FireObj.Fire(
+                    id_newfire, allfires.t, pixels, sensor=firessr, hull=cluster.hull
+                )
                 newfire.updateftype()  # update the fire type
+                allfires.pixtab.set_fid(pixels, id_newfire)
 
                 # add the new fire object to the fires list in the Allfires object
                 allfires.fires[id_newfire] = newfire
+                if opt_pixidx:
+                    allfires.pixidx.update(id_newfire, newfire.extlocs)
 
                 # increase the maximum id
                 idmax += 1
@@ -331,25 +405,28 @@ def Fire_expand_rtree(allfires, afp, fids_ea, log=True):
             f = allfires.fires[fmid]
 
             # update end time
-            f.t_ed = allfires.t
+            f.ti_ed = allfires.ti
 
             # update pixels
             f.pixels = f.pixels + newFPs
             f.newpixels = newFPs
+            allfires.pixtab.set_fid(newFPs, fmid)
             # if len(newFPs) > 0:
             #     f.actpixels = newFPs
 
             # update the hull using previous hull and previous exterior pixels
             # phull = f.hull   # previous hull
-            pextlocs = [p.loc for p in f.extpixels]  # previous external pixels
-            newlocs = [p.loc for p in newFPs]  # new added pixels
+            pextlocs = f.extlocs  # previous external pixels
+            newlocs = newFPs.locs  # new added pixels
             # f.hull = FireVector.update_hull(phull,pextlocs+newlocs)  # use update_hull function to save time
-            f.updatefhull(pextlocs + newlocs)
+            f.updatefhull(np.concatenate([pextlocs, newlocs]))
 
             # update exterior pixels
             # f.updateextpixels(f.extpixels+newFPs)
             f.updateextpixels(newFPs)
             # f.extpixels = FireVector.cal_extpixels(f.extpixels+newFPs,f.hull)
+            if opt_pixidx:
+                allfires.pixidx.update(fmid, f.extlocs)
 
             f.updateftype()  # update the fire type
             # t1 = time.time()
@@ -383,13 +460,22 @@ def Fire_merge_rtree(allfires, fids_ne, fids_ea, fids_sleep):
     """
 
     import FireClustering, FireVector, FireFuncs
-    from FireConsts import firessr  # CONNECTIVITY_THRESHOLD_KM
+    from FireConsts import firessr, opt_pixidx, opt_rngdist  # CONNECTIVITY_THRESHOLD_KM
+    import numpy as np
 
     # extract existing active fire data (use extending ranges)
-    eafirerngs = set_eafirerngs(allfires, fids_ea)
+    #   (if opt_rngdist, use the hulls and connecting distances instead of buffered hulls)
+    if opt_rngdist:
+        eafirerngs = [allfires.fires[fid].hull for fid in fids_ea]
+        eafiredists = set_rngdists(allfires, fids_ea)
+        eafirepreps = eafirerngs
+    else:
+        eafirerngs = set_eafirerngs(allfires, fids_ea)
+        eafiredists = [None] * len(fids_ea)
+        eafirepreps = set_eafirerngs(allfires, fids_ea, prep=True)  # for intersection tests
 
     # create a spatial index based on geometry bounds of fire connecting ranges
-    ea_idx = FireClustering.build_rtree(eafirerngs)
+    ea_idx = FireClustering.build_rtree(eafirerngs, bufs=eafiredists)
 
     # extract new and recently expanded fire data (use hulls without buffer)
     nefires = [allfires.fires[fid] for fid in fids_ne]
@@ -397,6 +483,15 @@ def Fire_merge_rtree(allfires, fids_ne, fids_ea, fids_sleep):
 
     # loop over all fire objects that have newly expanded or formed, record merging fire id pairs
     fids_merge = []  # initialize the merged fire id pairs (source id:target id)
+
+    # potential neighbors of all newly formed/expanded fires using the spatial index
+    iq, id_cf_all = FireClustering.idx_intersection_bulk(
+        ea_idx, [hull.bounds for hull in nefirehulls]
+    )
+    id_cfs_ne = [[] for _ in nefires]
+    for q, id_cf in zip(iq, id_cf_all):
+        id_cfs_ne[q].append(id_cf)
+
     firedone = {
         i: False for i in fids_ne
     }  # flag to mark an newly expanded fire obj that has been invalidated
@@ -405,16 +500,16 @@ def Fire_merge_rtree(allfires, fids_ne, fids_ea, fids_sleep):
         if (
             firedone[fid_ne] == False
         ):  # skip objects that have been merged to others in earlier loop
-            # potential neighbors
-            id_cfs = FireClustering.idx_intersection(ea_idx, nefirehulls[id_ne].bounds)
             # loop over all potential neighbor fobj candidiates
-            for id_ea in id_cfs:
+            for id_ea in id_cfs_ne[id_ne]:
                 fid_ea = fids_ea[id_ea]  # fire id of existing active fire
                 # if fid_ne == fid_ea, skip;
                 # if the expanded fire has been merged to a existing active fire, skip the rest loops
                 if fid_ne != fid_ea:
                     # if fire fmid is within distance of fire fid, two objects will merge
-                    if nefirehulls[id_ne].intersects(eafirerngs[id_ea]):
+                    if FireVector.rng_intersects(
+                        eafirepreps[id_ea], nefirehulls[id_ne], eafiredists[id_ea]
+                    ):
                         # the fire id of neighboring active Fobj
                         # depending on which fid is smaller, merge the two fire objects in different directions
                         if fid_ea > fid_ne:  # merge fid_ea to fid_ne
@@ -442,14 +537,31 @@ def Fire_merge_rtree(allfires, fids_ne, fids_ea, fids_sleep):
         ]
 
         # extract ne fires sleeper range
-        nefiresleeperrangs = set_sleeperrngs(allfires, fids_ne)
+        #   (if opt_rngdist, use the hulls and connecting distances instead of buffered hulls)
+        if opt_rngdist:
+            nefiresleeperrangs = nefirehulls
+            nefiresleeperdists = set_rngdists(allfires, fids_ne, sleeper=True)
+            nefiresleeperpreps = nefiresleeperrangs
+        else:
+            nefiresleeperrangs = set_sleeperrngs(allfires, fids_ne)
+            nefiresleeperdists = [None] * len(fids_ne)
+            nefiresleeperpreps = set_sleeperrngs(allfires, fids_ne, prep=True)
 
         # create a spatial index based on geometry bounds of ne fire sleeper ranges
-        ne_idx = FireClustering.build_rtree(nefiresleeperrangs)
+        ne_idx = FireClustering.build_rtree(nefiresleeperrangs, bufs=nefiresleeperdists)
 
         # nefirebuf  = [FireVector.addbuffer(hull,sleeperthresh*1000) for hull in nefirehulls]
         # ne_idx = FireClustering.build_rtree(nefirebuf)
 
+        # potential neighbors of all sleeper fire lines (skip sleepers without fire line)
+        ids_fline = [i for i, fline in enumerate(sleepflines) if fline is not None]
+        iq, id_ne_all = FireClustering.idx_intersection_bulk(
+            ne_idx, [sleepflines[i].bounds for i in ids_fline]
+        )
+        id_cfs_sleep = [[] for _ in sleepfires]
+        for q, id_ne in zip(iq, id_ne_all):
+            id_cfs_sleep[ids_fline[q]].append(id_ne)
+
         # do the check analoguous to above; loop over each sleeper fire
         firedone = {
             i: False for i in fids_sleep
@@ -463,14 +575,14 @@ def Fire_merge_rtree(allfires, fids_ne, fids_ea, fids_sleep):
             if (
                 firedone[fid_sleep] == False
             ):  # skip objects that have been merged to others in earlier loop
-                # potential neighbors
-                id_cfs = FireClustering.idx_intersection(
-                    ne_idx, sleepflines[id_sleep].bounds
-                )
                 # loop over all potential neighbour fobj candidates
-                for id_ne in id_cfs:
+                for id_ne in id_cfs_sleep[id_sleep]:
                     fid_ne = fids_ne[id_ne]
-                    if nefiresleeperrangs[id_ne].intersects(sleepflines[id_sleep]):
+                    if FireVector.rng_intersects(
+                        nefiresleeperpreps[id_ne],
+                        sleepflines[id_sleep],
+                        nefiresleeperdists[id_ne],
+                    ):
                         # depending on which fid is smaller, merge the two fire objects in different directions
                         if (
                             fid_ne > fid_sleep
@@ -498,7 +610,7 @@ def Fire_merge_rtree(allfires, fids_ne, fids_ea, fids_sleep):
             f_target = allfires.fires[fid2]
 
             # - target fire t_ed set to current time
-            f_target.t_ed = allfires.t
+            f_target.ti_ed = allfires.ti
 
             # just in case: set target to valid (is this needed?)
             f_target.invalid = False
@@ -506,19 +618,25 @@ def Fire_merge_rtree(allfires, fids_ne, fids_ea, fids_sleep):
             # - target fire add source pixels to pixels and newpixels
             f_target.pixels = f_target.pixels + f_source.pixels
             f_target.newpixels = f_target.newpixels + f_source.newpixels
+            allfires.pixtab.set_fid(f_source.pixels, fid2)
 
             # - update the hull using previous hull and previous exterior pixels
             phull = f_target.hull
-            pextlocs = [p.loc for p in f_target.extpixels]
-            newlocs = [p.loc for p in f_source.pixels]
+            pextlocs = f_target.extlocs
+            newlocs = f_source.locs
             # f_target.hull = FireVector.update_hull(phull,pextlocs+newlocs, sensor=firessr)
-            f_target.updatefhull(pextlocs + newlocs)
+            f_target.updatefhull(np.concatenate([pextlocs, newlocs]))
 
             # - use the updated hull to update exterior pixels
             f_target.extpixels = FireVector.cal_extpixels(
                 f_target.extpixels + f_source.pixels, f_target.hull
             )
 
+            # link the source fire to the target fire in the pixel index
+            if opt_pixidx:
+                allfires.pixidx.union(fid1, fid2)
+                allfires.pixidx.update(fid2, f_target.extlocs)
+
             # invalidate and deactivate source object
             f_source.invalid = True
             f_source.mergeid = f_target.mergeid
@@ -561,6 +679,7 @@ def Fire_Forward(tst, ted, restart=False, region=None):
     # import libraries
     import FireObj, FireIO, FireTime
     from FireConsts import firesrc, firenrt, opt_rmstatfire, remove_static_sources_bool, remove_static_sources_sourcefile
+    from FireConsts import opt_coldstore, opt_hullbudget
 
     import os
     import glob
@@ -641,11 +760,18 @@ def Fire_Forward(tst, ted, restart=False, region=None):
         logger.info(f"fids_new: {allfires.fids_new}")
         logger.info(f"fids_merged: {allfires.fids_merged}")
         logger.info(f"fids_invalid: {allfires.fids_invalid}")
+        if opt_hullbudget and len(allfires.fids_updated) > 0:
+            nverts = [allfires.fires[fid].n_hullvertices for fid in allfires.fids_updated]
+            logger.info(f"hull vertices: max {max(nverts)}, total {sum(nverts)}")
 
         # correct heritages at each time step?
         if len(allfires.heritages) > 0:
             allfires.heritages = correct_nested_ids(allfires.heritages)
 
+        # move dead fires (not changed at this time step) to the cold store
+        if opt_coldstore:
+            allfires.evict_deadfires(region[0])
+
         # 9. loop control
         #  - if t reaches ted, set endloop to True to stop the next loop
         if FireTime.t_dif(t, ted) == 0:
@@ -6,6 +6,11 @@ FOUR LAYERS OF OBJECTS
     b. Fire:      the class of a fire event
     c. Cluster:   the class of active fire pixel cluster (only for supporting)
     d. FirePixel: the class of an active fire pixel
+
+SUPPORTING OBJECTS
+    e. PixelIndex: the spatial index of recent fire pixels (used for expansion)
+    f. PixelTable: the columnar table of all fire pixels (owned by Allfires)
+    g. Pixels:     a set of fire pixels (a view into the PixelTable)
 """
 
 # a. Object - Allfires
@@ -26,7 +31,7 @@ class Allfires:
         import FireTime
 
         # self.t = FireTime.t_nb(t,nb='previous') # initialize the object at the previous time step
-        self.t = t
+        self.ti = FireTime.t2ti(t)  # half-day index of the time step (t is a view of it)
 
         # Allfires object contains a dict of Fire objects with fireID as the key (will be added after reading active fire data)
         self.fires = {}
@@ -52,7 +57,55 @@ class Allfires:
         )  # this list relates the list position of the fire in the allfires object to the fire id
         # (list_index, fireid) (list position can be variable when writing out only active fires)
 
+        # spatial index of exterior pixels of active fires (updated with fire expansion/merging)
+        self.pixidx = PixelIndex()
+
+        # columnar table of all fire pixels (fires hold Pixels views into it)
+        self.pixtab = PixelTable()
+
+        # fire ids by status ('active', 'sleeper', 'dead', 'invalid'), updated with
+        #   fire changes and aging (None: built from all fires when needed)
+        self._status = None
+        self._status_ti = None
+
+        # dead fires moved to the cold store, {fid: (file name, invalid)}
+        self.coldfires = {}
+        self._coldcache = {}  # recently loaded cold store files
+
+    def __getstate__(self):
+        """ Drop the loaded cold store files
+        """
+        state = self.__dict__.copy()
+        state.pop("_coldcache", None)
+        return state
+
+    def __setstate__(self, state):
+        """ Convert objects saved with (y,m,d,ampm) time steps or without a
+                cold store
+        """
+        import FireTime
+
+        state.setdefault("coldfires", {})
+        state["_coldcache"] = {}
+        if "t" in state:
+            state["ti"] = FireTime.t2ti(state.pop("t"))
+        self.__dict__.update(state)
+
     # properties
+    @property
+    def t(self):
+        """ Current time step, list (year, month, day, 'AM'|'PM')
+        """
+        import FireTime
+
+        return FireTime.ti2t(self.ti)
+
+    @t.setter
+    def t(self, t):
+        import FireTime
+
+        self.ti = FireTime.t2ti(t)
+
     @property
     def cday(self):
         """ Datetime date of current time step
@@ -73,72 +126,81 @@ class Allfires:
 
     @property
     def fids(self):
-        """ List of fire ids
+        """ List of fire ids (including fires in the cold store)
         """
-        return [i for i, f in self.fires.items()]
+        fids = [i for i, f in self.fires.items()]
+        if len(self.coldfires) > 0:
+            fids = sorted(fids + list(self.coldfires))
+        return fids
 
     @property
     def number_of_fires(self):
         """ Total number of fires (active and inactive) at this time step
         """
-        return len(self.fires)
+        return len(self.fires) + len(self.coldfires)
 
     @property
     def fids_active(self):
         """ List of active fire ids
         """
-        return [i for i, f in self.fires.items() if f.isactive]
+        return sorted(self.getstatus()["active"])
 
     @property
     def number_of_activefires(self):
         """ Total number of active fires at this time step
         """
-        return len(self.fids_active)
+        return len(self.getstatus()["active"])
 
     @property
     def activefires(self):
         """ dict of active fires
         """
-        return {i: f for i, f in self.fires.items() if f.isactive}
+        return {i: self.fires[i] for i in self.fids_active}
 
     @property
     def mayactivefires(self):
         """ dict of active fires and sleepers
         """
-        return {i: f for i, f in self.fires.items() if (f.isactive or f.mayreactivate)}
+        status = self.getstatus()
+        fids = sorted(status["active"] | status["sleeper"])
+        return {i: self.fires[i] for i in fids}
 
     @property
     def deadfires(self):
         """ dict of inactive fires not going to be reactivated
+            (fires in the cold store are loaded)
         """
-        return {
-            i: f for i, f in self.fires.items() if not (f.isactive or f.mayreactivate)
-        }
+        fids = self.fids_dead
+        return dict(zip(fids, self.getfires(fids)))
 
     @property
     def fids_dead(self):
         """ List of fire ids that is not going to be reactivated
         """
-        return [i for i, f in self.fires.items() if not (f.isactive or f.mayreactivate)]
+        status = self.getstatus()
+        return sorted(status["dead"] | status["invalid"] | self.coldfires.keys())
 
     @property
     def fids_sleeper(self):
         """ List of fire ids that may reactivate
         """
-        return [i for i, f in self.fires.items() if f.mayreactivate]
+        return sorted(self.getstatus()["sleeper"])
 
     @property
     def number_of_sleeper(self):
         """ Total number of sleep fires at this time step
         """
-        return len(self.fids_sleeper)
+        return len(self.getstatus()["sleeper"])
 
     @property
     def fids_valid(self):
         """ List of valid (non-invalid) fire ids
         """
         # return [self.fires[f].fireID for f in self.fires if self.fires[f].invalid is False]
-        return [i for i, f in self.fires.items() if f.invalid is False]
+        status = self.getstatus()
+        fids = status["active"] | status["sleeper"] | status["dead"]
+        fids |= {i for i, (fnm, invalid) in self.coldfires.items() if not invalid}
+        return sorted(fids)
 
     @property
     def number_of_validfires(self):
@@ -151,7 +213,8 @@ class Allfires:
         """ List of valid fires
         """
         # return [self.fires[fid] for fid in self.fids_valid]
-        return {i: f for i, f in self.fires.items() if f.invalid is False}
+        fids = self.fids_valid
+        return dict(zip(fids, self.getfires(fids)))
 
     @property
     def fids_updated(self):
@@ -176,6 +239,161 @@ class Allfires:
         fids_ne = sorted(set(self.fids_expanded + self.fids_new))
         return fids_ne
 
+    # fires in the cold store
+    def getfire(self, fid):
+        """ Get a fire object, loading it from the cold store if it is not in memory
+            (a fire from the cold store gets the current time, like the fires in memory)
+        Parameters
+        ----------
+        fid : int
+            fire id
+        """
+        import FireIO
+
+        if fid in self.fires:
+            return self.fires[fid]
+        fnm, invalid = self.coldfires[fid]
+        if fnm not in self._coldcache:
+            if len(self._coldcache) >= 8:  # keep a few recently loaded files
+                self._coldcache.pop(next(iter(self._coldcache)))
+            self._coldcache[fnm] = FireIO.load_coldfires(fnm)
+        f = self._coldcache[fnm][fid]
+        f.ti = self.ti
+        return f
+
+    def getfires(self, fids):
+        """ Get a list of fire objects, loading each needed cold store file once
+            (like getfire, fires from the cold store get the current time)
+        Parameters
+        ----------
+        fids : list
+            fire ids
+        Returns
+        -------
+        fires : list
+            the fire objects in the order of fids
+        """
+        import FireIO
+
+        # group the fires in the cold store by file
+        fids_cold = {}
+        for fid in fids:
+            if fid not in self.fires:
+                fids_cold.setdefault(self.coldfires[fid][0], []).append(fid)
+
+        coldfires = {}
+        for fnm, fids_f in fids_cold.items():
+            fires_f = self._coldcache.get(fnm)
+            if fires_f is None:
+                fires_f = FireIO.load_coldfires(fnm)
+            for fid in fids_f:
+                coldfires[fid] = fires_f[fid]
+                coldfires[fid].ti = self.ti
+        return [self.fires[fid] if fid in self.fires else coldfires[fid] for fid in fids]
+
+    def evict_deadfires(self, regnm):
+        """ Move dead and invalid fires not changed at this time step to the
+                cold store (one file for each time step)
+        Parameters
+        ----------
+        regnm : str
+            the region name
+        """
+        import FireIO
+
+        status = self.getstatus()
+        fids_updated = set(self.fids_updated)
+        fids = sorted((status["dead"] | status["invalid"]) - fids_updated)
+        if len(fids) == 0:
+            return
+
+        # save the fires with their own pixel table
+        fires = {fid: self.fires[fid] for fid in fids}
+        self._movepixels(fires.values())
+        fnm = FireIO.save_coldfires(fires, self.t, regnm)
+
+        # record the fires in the cold store index and remove them from memory
+        for fid, f in fires.items():
+            self.coldfires[fid] = (fnm, f.invalid)
+            status["dead"].discard(fid)
+            status["invalid"].discard(fid)
+            del self.fires[fid]
+
+        # drop the pixels of the removed fires from the pixel table if they
+        #   take more than half of it
+        nrows = sum(f.n_pixels for f in self.fires.values())
+        if self.pixtab.n > 2 * nrows:
+            self.pixtab = self._movepixels(self.fires.values())
+
+    def _movepixels(self, fires):
+        """ Copy the pixels of fires to a new pixel table and point the fires to it
+        Parameters
+        ----------
+        fires : list
+            fire objects (with pixels in the pixel table)
+        Returns
+        -------
+        pixtab : PixelTable
+            the new pixel table
+        """
+        import numpy as np
+
+        attrs = ["pixels", "newpixels", "ignpixels", "extpixels"]
+        fires = list(fires)
+        rows = [getattr(f, a).rows for f in fires for a in attrs]
+        rows = np.unique(np.concatenate(rows)) if len(rows) > 0 else rows
+
+        pixtab = PixelTable()
+        pixtab.data = self.pixtab.data[rows]
+        pixtab.n = len(rows)
+        for f in fires:
+            for a in attrs:
+                setattr(f, a, Pixels(pixtab, np.searchsorted(rows, getattr(f, a).rows)))
+        return pixtab
+
+    # fire status sets
+    def getstatus(self):
+        """ Sets of fire ids by status ('active', 'sleeper', 'dead', 'invalid'),
+            rebuilt from all fires if missing or not covering all fires, and
+            aged if the time has changed since the last update
+        """
+        status = getattr(self, "_status", None)
+        if status is None or sum(len(v) for v in status.values()) != len(self.fires):
+            status = {"active": set(), "sleeper": set(), "dead": set(), "invalid": set()}
+            for i, f in self.fires.items():
+                status[f.status].add(i)
+            self._status = status
+            self._status_ti = self.ti
+        elif self._status_ti != self.ti:
+            self.age_status()
+        return self._status
+
+    def update_status(self, fids):
+        """ Update the status of fires (after expansion, merging or invalidation)
+        Parameters
+        ----------
+        fids : list
+            ids of fires with changes
+        """
+        status = getattr(self, "_status", None)
+        if status is None:  # built from all fires when needed
+            return
+        for fid in fids:
+            for v in status.values():
+                v.discard(fid)
+            status[self.fires[fid].status].add(fid)
+
+    def age_status(self):
+        """ Update the status of active fires and sleepers after a time change
+            (dead and invalid fires keep their status)
+        """
+        status = self._status
+        fids = status["active"] | status["sleeper"]
+        status["active"], status["sleeper"] = set(), set()
+        for fid in fids:
+            status[self.fires[fid].status].add(fid)
+        self._status_ti = self.ti
+
     # functions to be run before tracking VIIRS active fire pixels at each time step
     def update_t(self, t):
         """ Update the time (cday and ampm) for the Allfire object.
@@ -193,21 +411,32 @@ class Allfires:
         t : tuple, (int,int,int,str)
             the year, month, day and 'AM'|'PM'
         """
+        import FireTime
+
+        ti = FireTime.t2ti(t)
         for i, f in self.fires.items():
-            f.t = list(t)
+            f.ti = ti
 
     def reset_newpixels(self):
-        """ Reset newpixels to [] for each fire.
+        """ Reset newpixels to empty for each fire.
         """
         for i, f in self.fires.items():
-            f.newpixels = []
+            f.newpixels = f.pixels[:0]
 
     def cleanup(self, t):
         """ Clean up Allfires obj at each time step
         - update t (for allfires and all fires)
         - clean up lists to record fire changes
-        - clean up newpixels for each fire
+        - clean up newpixels (and cached fire lines) for each fire
+        - remove fires no longer active from the pixel index
+        - update the fire status sets
         """
+        from FireConsts import opt_pixidx
+
+        # only keep fires active at previous time step in the pixel index
+        if opt_pixidx:
+            self.pixidx.prune(self.fids_active)
+
         # time updated to t
         self.update_t(t)  # update t for allfires
         self.update_t_allfires(t)  # update t
@@ -226,14 +455,19 @@ class Allfires:
             []
         )  # a list of ids for fires invalidated at current time step
 
-        # reset newpixels for each fire to empty list.
+        # reset newpixels (and the per time step fire line cache) for each fire.
         for i, f in self.fires.items():
-            f.newpixels = []
+            f.newpixels = f.pixels[:0]
+            f._stepcache = None
+
+        # age the fire status sets (all at once, for the new time)
+        self.getstatus()
 
     def newyear_reset(self, regnm):
         """ reset fire ids at the start of a new year
         """
         import FireIO
+        from FireConsts import opt_pixidx
 
         # re-id all active fires
         newfires = {}
@@ -242,8 +476,19 @@ class Allfires:
         for i, fid in enumerate(fids_keep):
             newfires[i] = self.fires[fid]  # record new fireID and fire object
             newfires[i].fireID = i  # also update fireID attribute of fire object
+            self.pixtab.set_fid(newfires[i].pixels, i)
             fidmapping.append((fid, i))
         self.fires = newfires
+        self._status = None  # rebuilt with the new fire ids
+
+        # clear the cold store and keep only pixels of the kept fires
+        self.coldfires = {}
+        self._coldcache = {}
+        self.pixtab = self._movepixels(self.fires.values())
+
+        # rebuild the pixel index using new fire ids
+        if opt_pixidx:
+            self.build_pixidx()
 
         # lastyearfires = {}
         # fidmapping = []
@@ -264,6 +509,54 @@ class Allfires:
         if len(fidmapping) > 0:
             FireIO.save_newyearfidmapping(fidmapping, self.t[0], regnm)
 
+    def build_pixtab(self):
+        """ Build the pixel table from fires holding lists of FirePixel objects
+            (objects saved before the pixel table was introduced)
+        """
+        import numpy as np
+
+        self.pixtab = PixelTable()
+        for fid, f in self.fires.items():
+            # pixel lists share FirePixel objects; add each object once (new
+            #   pixels were detected at t_ed, other pixels are dated at t_st)
+            rows = {}
+            for attr, t in [
+                ("newpixels", f.t_ed),
+                ("pixels", f.t_st),
+                ("ignpixels", f.t_st),
+                ("extpixels", f.t_st),
+            ]:
+                fps_new = [p for p in getattr(f, attr) if id(p) not in rows]
+                if len(fps_new) > 0:
+                    pixels = self.pixtab.append(
+                        t,
+                        [p.x for p in fps_new],
+                        [p.y for p in fps_new],
+                        [p.lon for p in fps_new],
+                        [p.lat for p in fps_new],
+                        [p.frp for p in fps_new],
+                        [p.DS for p in fps_new],
+                        [p.DT for p in fps_new],
+                        [p.ampm for p in fps_new],
+                        [p.datetime for p in fps_new],
+                        [p.sat for p in fps_new],
+                        [p.origin for p in fps_new],
+                    )
+                    self.pixtab.set_fid(pixels, fid)
+                    rows.update(zip([id(p) for p in fps_new], pixels.rows))
+                setattr(
+                    f,
+                    attr,
+                    Pixels(self.pixtab, [rows[id(p)] for p in getattr(f, attr)]),
+                )
+
+    def build_pixidx(self):
+        """ (Re)build the pixel index using exterior pixels of all active fires
+        """
+        self.pixidx = PixelIndex()
+        for fid in self.fids_active:
+            self.pixidx.update(fid, self.fires[fid].extlocs)
+
     # functions to be run after tracking VIIRS active fire pixels at each time step
     def record_fids_change(
         self, fids_expanded=None, fids_new=None, fids_merged=None, fids_invalid=None
@@ -291,11 +584,110 @@ class Allfires:
                 fids_invalid  # fires invalidated due to merging with other fires
             )
 
+        # update the status of the changed fires
+        for fids in [fids_expanded, fids_new, fids_merged, fids_invalid]:
+            if fids:
+                self.update_status(fids)
+
+    def cal_fireattrs(self, fids=None):
+        """ Calculate the derived attributes (farea, fperim, pixden, meanFRP) of
+                fires in one pass and keep them in the per time step cache of
+                each fire
+        Parameters
+        ----------
+        fids : list
+            ids of fires (None: all fires)
+        """
+        if fids is None:
+            fids = list(self.fires)
+        self._cal_fireattrs(self.getfires(fids))
+
+    @staticmethod
+    def _cal_fireattrs(fires):
+        """ Calculate the derived attributes of a list of fire objects (see cal_fireattrs)
+        """
+        import numpy as np
+        from FireConsts import area_VI
+
+        if len(fires) == 0:
+            return
+
+        # FRP of new pixels of all fires
+        frp = np.concatenate([f.newpixels.frp for f in fires])
+        bnds = np.cumsum([0] + [f.n_newpixels for f in fires])
+
+        for i, f in enumerate(fires):
+            cache = f._getstepcache()
+            fhull = f.hull
+            if fhull is None:
+                farea, fperim = f.n_pixels * area_VI, 0
+            else:
+                farea, fperim = max(fhull.area / 1e6, area_VI), fhull.length / 1e3
+            cache["farea"] = farea
+            cache["fperim"] = fperim
+            cache["pixden"] = f.n_pixels / farea if farea > 0 else 0
+            cache["meanFRP"] = (
+                frp[bnds[i] : bnds[i + 1]].mean() if bnds[i + 1] > bnds[i] else 0
+            )
+
+    def to_frame(self, fids=None, attributes=None, hull=False):
+        """ Extract attributes of fires to a DataFrame (one row for each fire)
+        Parameters
+        ----------
+        fids : list
+            ids of fires (None: all fires in memory)
+        attributes : dict or list
+            the attribute names, or {name: type} to force the column types;
+            'datetime64' time steps (t, t_st, t_ed) are converted at once
+        hull : bool
+            if set to true, return a GeoDataFrame with the fire hulls as geometry
+        Returns
+        -------
+        df : pandas DataFrame or geopandas GeoDataFrame
+            the fire attributes, indexed by fireID
+        """
+        import pandas as pd
+        import FireTime
+        from FireConsts import epsg
+
+        if fids is None:
+            fids = list(self.fires)
+        if attributes is None:
+            attributes = []
+        fires = self.getfires(fids)
+
+        # calculate the cached attributes in one pass
+        if {"farea", "fperim", "pixden", "meanFRP"} & set(attributes):
+            self._cal_fireattrs(fires)
+
+        cols = {}
+        for k in attributes:
+            if k in ["t", "t_st", "t_ed"]:  # time steps from the half-day indices
+                ti = [getattr(f, "ti" + k[1:]) for f in fires]
+                cols[k] = FireTime.ti2dt64(ti).astype("datetime64[ns]")
+            else:
+                cols[k] = [getattr(f, k) for f in fires]
+        df = pd.DataFrame(cols, index=pd.Index(fids, name="fireID"), columns=list(attributes))
+
+        # force the column types
+        if isinstance(attributes, dict):
+            for k, tp in attributes.items():
+                df[k] = df[k].astype(tp)
+
+        if hull:
+            import geopandas as gpd
+
+            df = gpd.GeoDataFrame(
+                df, geometry=[f.hull for f in fires], crs="epsg:" + str(epsg)
+            )
+        return df
+
     def invalidate_statfires(self):
         """ If pixel density of an active fire is too large, assume it's static
                 fires and invalidate it.
         """
         try:
+            self.cal_fireattrs(self.fids_active)
             for i, f in self.activefires.items():
                 if (f.pixden > 20) & (f.farea < 20):
                     # invalidate the fire
@@ -303,6 +695,7 @@ class Allfires:
 
                     # add the fire id into the fids_invalid list
                     self.fids_invalid.append(f.fireID)
+                    self.update_status([f.fireID])
                     print('one static fire invalidated')
         except Exception as e:
             print(e)
@@ -336,7 +729,7 @@ class Fire:
     """
 
     # initilization
-    def __init__(self, id, t, pixels, sensor="viirs"):
+    def __init__(self, id, t, pixels, sensor="viirs", hull=None, extpixels=None):
         """ Initialize Fire class with active fire pixels locations and t. This
                 is only called when fire clusters forming a new Fire object.
         Parameters
@@ -345,13 +738,17 @@ class Fire:
             fire id
         t : tuple, (int,int,int,str)
             the year, month, day and 'AM'|'PM'
-        pixels : list (nx5)
-            latitude, longitude, line, sample, and FRP values of active fire pixels
+        pixels : Pixels
+            the active fire pixels of the new fire
         sensor : str
             the remote sensing instrument, 'viirs' | 'modis'; no differentiation
             between SNPP and NOAA20
+        hull : geometry
+            precomputed hull of the pixels (None: calculated from pixels)
+        extpixels : Pixels
+            precomputed exterior pixels (None: calculated from pixels and hull)
         """
-        import FireVector
+        import FireVector, FireTime
 
         # initialize fire id and sensor
         self.fireID = id
@@ -359,10 +756,11 @@ class Fire:
         self.sensor = sensor  #
 
         # initialize current time, fire start time, and fire final time
-        tlist = list(t)  # convert (y,m,d,ampm) to [y,m,d,ampm]
-        self.t = tlist  # current time
-        self.t_st = tlist
-        self.t_ed = tlist
+        #   (half-day indices; t, t_st and t_ed are (y,m,d,ampm) views of them)
+        ti = FireTime.t2ti(t)
+        self.ti = ti  # current time
+        self.ti_st = ti
+        self.ti_ed = ti
 
         # initialize pixels
         # fpixels = [FirePixel((p[0],p[1]),(p[2],p[3],p[4]),tlist,id) for p in pixels]
@@ -372,15 +770,21 @@ class Fire:
         # self.actpixels = fpixels   # new detected pixels of last active fire detection
         self.ignpixels = fpixels  # pixels at ignition
 
-        # initialize hull using the pixels
-        locs = [p.loc for p in fpixels]  # list of [lat,lon]
-        # locs_geo = [p.loc_geo for p in fpixels]  # list of [lat,lon]
-        hull = FireVector.cal_hull(locs, sensor)  # the hull from all locs
+        # initialize hull using the pixels (if not precomputed, e.g. from a cluster)
+        if hull is None:
+            locs = fpixels.locs  # array of [x,y]
+            # locs_geo = [p.loc_geo for p in fpixels]  # list of [lat,lon]
+            hull = FireVector.cal_hull(locs, sensor)  # the hull from all locs
         self.hull = hull  # note fire.hull is not automatically updated (need explicit calculation if changes occur)
 
         # initialize the exterior pixels (pixels within the inward extbuffer of
         #    the hull; used for saving time for hull calculation of large fires)
-        self.extpixels = FireVector.cal_extpixels(fpixels, hull)
+        if extpixels is None:
+            extpixels = FireVector.cal_extpixels(fpixels, hull)
+        self.extpixels = extpixels
+
+        # burned-cell bitmap used for the hull of very large fires (see updatefhull)
+        self.hullbitmap = None
 
         # fline of latest active timestep, used for sleeper threshold
         self.fline_prior = None
@@ -395,7 +799,67 @@ class Fire:
         # vLCT = FireIO.get_LCT(locs)
         # self.LCTmax = max(set(vLCT), key = vLCT.count)
 
+    def __getstate__(self):
+        """ Drop cached geometries (prepared geometries can't be pickled)
+        """
+        state = self.__dict__.copy()
+        state.pop("_rngcache", None)
+        state.pop("_stepcache", None)
+        return state
+
+    def __setstate__(self, state):
+        """ Convert objects saved with (y,m,d,ampm) time steps
+        """
+        import FireTime
+
+        for k in ["t", "t_st", "t_ed"]:
+            if k in state:
+                state["ti" + k[1:]] = FireTime.t2ti(state.pop(k))
+        self.__dict__.update(state)
+
     # properties
+    @property
+    def t(self):
+        """ Current time step, list (year, month, day, 'AM'|'PM')
+        """
+        import FireTime
+
+        return FireTime.ti2t(self.ti)
+
+    @t.setter
+    def t(self, t):
+        import FireTime
+
+        self.ti = FireTime.t2ti(t)
+
+    @property
+    def t_st(self):
+        """ Time step of the first active fire detection
+        """
+        import FireTime
+
+        return FireTime.ti2t(self.ti_st)
+
+    @t_st.setter
+    def t_st(self, t):
+        import FireTime
+
+        self.ti_st = FireTime.t2ti(t)
+
+    @property
+    def t_ed(self):
+        """ Time step of the last active fire detection
+        """
+        import FireTime
+
+        return FireTime.ti2t(self.ti_ed)
+
+    @t_ed.setter
+    def t_ed(self, t):
+        import FireTime
+
+        self.ti_ed = FireTime.t2ti(t)
+
     @property
     def cday(self):
         """ Current day (datetime date)
@@ -422,7 +886,7 @@ class Fire:
         """
         import FireTime
 
-        duration = FireTime.t_dif(self.t_st, self.t_ed)  # + 0.5
+        duration = FireTime.ti_dif(self.ti_st, self.ti_ed)  # + 0.5
         return duration
 
     @property
@@ -431,7 +895,7 @@ class Fire:
         """
         import FireTime
 
-        t_inactive = FireTime.t_dif(self.t_ed, self.t)
+        t_inactive = FireTime.ti_dif(self.ti_ed, self.ti)
         return t_inactive
 
     @property
@@ -470,32 +934,45 @@ class Fire:
         # otherwise, set to True if no new pixels detected for 5 consecutive days
         return maxoffdays < self.t_inactive <= limoffdays
 
+    @property
+    def status(self):
+        """ Fire status, 'active' | 'sleeper' | 'dead' | 'invalid'
+        """
+        from FireConsts import maxoffdays, limoffdays
+
+        if self.invalid:
+            return "invalid"
+        t_inactive = self.t_inactive
+        if t_inactive <= maxoffdays:
+            return "active"
+        if t_inactive <= limoffdays:
+            return "sleeper"
+        return "dead"
+
     @property
     def isignition(self):
         """ Is the current timestep the ignition?
         when start time == end time; and new pixel > 0
         """
-        import FireTime
-
         if (
             len(self.newpixels) == 0
         ):  # in this case t_st = t_ed because t_ed has not been updated
             ign = 0
         else:
-            ign = (FireTime.t_dif(self.t_st, self.t_ed) == 0) * 1
+            ign = (self.ti_st == self.ti_ed) * 1
         return ign
 
     @property
     def locs(self):
-        """ List of fire pixel locations (lat,lon)
+        """ Fire pixel locations (x,y), np array (nx2)
         """
-        return [p.loc for p in self.pixels]
+        return self.pixels.locs
 
     @property
     def locs_geo(self):
-        """ List of fire pixel locations (lat,lon)
+        """ Fire pixel locations (lon,lat), np array (nx2)
         """
-        return [p.loc_geo for p in self.pixels]
+        return self.pixels.locs_geo
 
     @property
     def locsMP(self):
@@ -503,8 +980,10 @@ class Fire:
         """
         from shapely.geometry import MultiPoint
 
-        mp = MultiPoint([(p[0], p[1]) for p in self.locs])
-        return mp
+        cache = self._getstepcache()
+        if "locsMP" not in cache:
+            cache["locsMP"] = MultiPoint([(p[0], p[1]) for p in self.locs])
+        return cache["locsMP"]
 
     @property
     def n_pixels(self):
@@ -513,15 +992,15 @@ class Fire:
 
     @property
     def newlocs(self):
-        """ List of new fire pixels locations (lat,lon)
+        """ New fire pixels locations (x,y), np array (nx2)
         """
-        return [p.loc for p in self.newpixels]
+        return self.newpixels.locs
 
     @property
     def newlocs_geo(self):
-        """ List of new fire pixels locations (lat,lon)
+        """ New fire pixels locations (lon,lat), np array (nx2)
         """
-        return [p.loc_geo for p in self.newpixels]
+        return self.newpixels.locs_geo
 
     @property
     def newlocsMP(self):
@@ -529,17 +1008,21 @@ class Fire:
         """
         from shapely.geometry import MultiPoint
 
-        mp = MultiPoint([(p[0], p[1]) for p in self.newlocs])
-        return mp
+        cache = self._getstepcache()
+        if "newlocsMP" not in cache:
+            cache["newlocsMP"] = MultiPoint([(p[0], p[1]) for p in self.newlocs])
+        return cache["newlocsMP"]
 
     @property
     def newpixelatts(self):
         """ List of new fire pixels attributes
         """
-        return [
-            (p.lon, p.lat, p.frp, p.DS, p.DT, p.datetime, p.ampm, p.sat)
-            for p in self.newpixels
-        ]
+        nps = self.newpixels
+        return list(
+            zip(
+                nps.lon, nps.lat, nps.frp, nps.DS, nps.DT, nps.datetime, nps.ampm, nps.sat
+            )
+        )
 
     @property
     def n_newpixels(self):
@@ -549,9 +1032,9 @@ class Fire:
 
     @property
     def extlocs(self):
-        """ List of exterior fire pixel locations (lat,lon)
+        """ Exterior fire pixel locations (x,y), np array (nx2)
         """
-        return [p.loc for p in self.extpixels]
+        return self.extpixels.locs
 
     @property
     def extlocsMP(self):
@@ -559,8 +1042,10 @@ class Fire:
         """
         from shapely.geometry import MultiPoint
 
-        mp = MultiPoint([(p[0], p[1]) for p in self.extlocs])
-        return mp
+        cache = self._getstepcache()
+        if "extlocsMP" not in cache:
+            cache["extlocsMP"] = MultiPoint([(p[0], p[1]) for p in self.extlocs])
+        return cache["extlocsMP"]
 
     @property
     def n_extpixels(self):
@@ -568,11 +1053,19 @@ class Fire:
         """
         return len(self.extpixels)
 
+    @property
+    def n_hullvertices(self):
+        """ Number of vertices of the fire hull
+        """
+        import FireVector
+
+        return FireVector.count_vertices(self.hull)
+
     @property
     def ignlocs(self):
-        """ List of fire pixel locations (lat,lon) at ignition time step
+        """ Fire pixel locations (x,y) at ignition time step, np array (nx2)
         """
-        return [p.loc for p in self.ignpixels]
+        return self.ignpixels.locs
 
     @property
     def ignlocsMP(self):
@@ -580,14 +1073,16 @@ class Fire:
         """
         from shapely.geometry import MultiPoint
 
-        mp = MultiPoint([(p[0], p[1]) for p in self.ignlocs])
-        return mp
+        cache = self._getstepcache()
+        if "ignlocsMP" not in cache:
+            cache["ignlocsMP"] = MultiPoint([(p[0], p[1]) for p in self.ignlocs])
+        return cache["ignlocsMP"]
 
     @property
     def ignlocs_geo(self):
-        """ List of fire pixel locations (lat,lon) at ignition time step
+        """ Fire pixel locations (lon,lat) at ignition time step, np array (nx2)
         """
-        return [p.loc_geo for p in self.ignpixels]
+        return self.ignpixels.locs_geo
 
     @property
     def ignlocsMP_geo(self):
@@ -595,8 +1090,10 @@ class Fire:
         """
         from shapely.geometry import MultiPoint
 
-        mp = MultiPoint([(p[0], p[1]) for p in self.ignlocs_geo])
-        return mp
+        cache = self._getstepcache()
+        if "ignlocsMP_geo" not in cache:
+            cache["ignlocsMP_geo"] = MultiPoint([(p[0], p[1]) for p in self.ignlocs_geo])
+        return cache["ignlocsMP_geo"]
 
     @property
     def n_ignpixels(self):
@@ -611,12 +1108,16 @@ class Fire:
         from FireConsts import area_VI
         import numpy as np
 
+        cache = self._getstepcache()
+        if "farea" in cache:
+            return cache["farea"]
+
         # get hull
         fhull = self.hull
 
         # If no hull, return area calculated from number of pixels
         if fhull is None:
-            return self.n_pixels * area_VI
+            farea = self.n_pixels * area_VI
         # otherwise, use calConcHarea to calculate area,
         #   but no smaller than area_VI (sometimes calculated hull area is very small)
         else:
@@ -624,7 +1125,10 @@ class Fire:
             # geod = Geod(ellps="WGS84")
             # area_cal = np.abs(geod.geometry_area_perimeter(self.hull)[0]/1e6)
             area_cal = fhull.area / 1e6
-            return max(area_cal, area_VI)
+            farea = max(area_cal, area_VI)
+
+        cache["farea"] = farea
+        return farea
 
             # import FireVector
             # return max(FireVector.calConcHarea(fhull),area_VI)
@@ -648,21 +1152,27 @@ class Fire:
     def pixden(self):
         """ Fire pixel density (number of pixels per km2 fire area)
         """
-        farea = self.farea
-        if farea > 0:
-            return self.n_pixels / farea
-        else:
-            return 0
+        cache = self._getstepcache()
+        if "pixden" not in cache:
+            farea = self.farea
+            cache["pixden"] = self.n_pixels / farea if farea > 0 else 0
+        return cache["pixden"]
 
     @property
     def meanFRP(self):
         """ Mean FRP of the new fire pixels
         """
-        frps = [p.frp for p in self.newpixels]
+        cache = self._getstepcache()
+        if "meanFRP" in cache:
+            return cache["meanFRP"]
+
+        frps = self.newpixels.frp
         if len(frps) > 0:
-            m = sum(frps) / len(frps)
+            m = frps.mean()
         else:
             m = 0
+
+        cache["meanFRP"] = m
         return m
 
     @property
@@ -677,6 +1187,10 @@ class Fire:
     def fperim(self):
         """ Perimeter length of fire hull
         """
+        cache = self._getstepcache()
+        if "fperim" in cache:
+            return cache["fperim"]
+
         # get hull
         fhull = self.hull
 
@@ -687,49 +1201,61 @@ class Fire:
             # geod = Geod(ellps="WGS84")
             # perim = geod.geometry_length(fhull)/1000 # in km
             perim = fhull.length / 1e3  # km
+
+        cache["fperim"] = perim
         return perim
 
+    def _getstepcache(self):
+        """ Per time step cache of derived attributes (fire line, area, ...), valid
+            for the current hull and pixel sets (cleared in Allfires.cleanup)
+        """
+        key = (self.hull, self.pixels, self.newpixels, self.extpixels, self.ignpixels)
+        cache = getattr(self, "_stepcache", None)
+        if cache is None or any(a is not b for a, b in zip(cache["key"], key)):
+            cache = {"key": key}
+            self._stepcache = cache
+        return cache
+
     @property
     def flinepixels(self):
         """ List of all fire pixels near the fire perimeter (fine line pixels)
         """
-        from shapely.geometry import Point, MultiLineString
         import FireVector
         from FireConsts import fpbuffer
 
+        cache = self._getstepcache()
+        if "flinepixels" in cache:
+            return cache["flinepixels"]
+
         # get pixels of last active fire detection
         nps = self.newpixels
 
         # get hull
         fhull = self.hull
 
-        if fhull is None:  # if no hull, return empty list
-            return []
+        flinepixels = None
+        if fhull is None:  # if no hull, return empty pixels
+            flinepixels = nps[:0]
         else:
             try:
-                # otherwise, extract the pixels nearl the hull
-                # if hull is a polygon, return new pixels near the hull
-                if fhull.type == "Polygon":
-                    # lr = fhull.exterior.buffer(fpbuffer)
-                    lr = FireVector.addbuffer(fhull.exterior, fpbuffer)
-                    return [p for p in nps if lr.contains(Point(p.loc[0], p.loc[1]))]
-
-                # if hull is a multipolygon, return new pixels near the hull
-                elif fhull.type == "MultiPolygon":
-                    # mlr = MultiLineString([x.exterior for x in fhull]).buffer(fpbuffer)
-                    mlr = MultiLineString([x.exterior for x in fhull])
-                    mlr = FireVector.addbuffer(mlr, fpbuffer)
-                    return [p for p in nps if mlr.contains(Point(p.loc[0], p.loc[1]))]
-            
+                # otherwise, extract the new pixels near the hull exterior(s)
+                #   (within fpbuffer of the exterior of the polygon or multipolygon)
+                if fhull.type in ["Polygon", "MultiPolygon"]:
+                    near = FireVector.near_boundary(fhull, nps.locs, fpbuffer)
+                    flinepixels = nps[near]
+
             except Exception as e:
                 print(e)
-                return []
+                flinepixels = nps[:0]
+
+        cache["flinepixels"] = flinepixels
+        return flinepixels
 
     @property
     def flplocs(self):
-        """ List of fire line pixel locations (lat,lon)
+        """ Fire line pixel locations (x,y), np array (nx2)
         """
-        return [p.loc for p in self.flinepixels]
+        return self.flinepixels.locs
 
     @property
     def flplocsMP(self):
@@ -755,9 +1281,14 @@ class Fire:
         from FireConsts import flbuffer, VIIRSbuf
         import FireVector
 
+        cache = self._getstepcache()
+        if "fline" in cache:
+            return cache["fline"]
+
         if (
             self.n_flinepixels == 0
         ):  # this happens is last active pixels are within the fire scar
+            cache["fline"] = None
             return None
 
         # get fireline pixel locations, different from flplocsMP since it contains a VIIRS pixel buffer
@@ -768,11 +1299,12 @@ class Fire:
 
         # calculate the fire line
         if fhull is None:  # if no hull, return None
+            cache["fline"] = None
             return None
         else:  # otherwise, create shape of the active fire line
             if fhull.type == "MultiPolygon":
                 # extract exterior of fire perimeter
-                mls = MultiLineString([plg.exterior for plg in fhull])
+                mls = MultiLineString([plg.exterior for plg in fhull.geoms])
                 # return the part which intersects with  bufferred flinelocsMP
                 # return mls.intersection(flinelocsMP.buffer(flbuffer))
                 flinelocsMP_buf = FireVector.addbuffer(flinelocsMP, flbuffer)
@@ -789,6 +1321,7 @@ class Fire:
             # we save the fire line to a new property (this is only updated when fline not None)
             self.fline_prior = fline
 
+            cache["fline"] = fline
             return fline
 
     @property
@@ -814,16 +1347,72 @@ class Fire:
         import FireFuncs
 
         self.ftype = FireFuncs.set_ftype(self)
+        self._rngcache = None  # connecting ranges depend on ftype
+
+    def connrng(self, dist, prep=False):
+        """ Connecting range (hull plus a buffer of dist, in m) of the fire,
+            cached until the hull or ftype changes
+
+        Parameters
+        ----------
+        dist : float
+            the buffer distance (m)
+        prep : bool
+            if set to true, return the prepared geometry of the range
+
+        Returns
+        -------
+        rng : geometry | PreparedGeometry
+            the connecting range
+        """
+        import FireVector
+        from shapely.prepared import prep as prepare
+
+        # the cache is only valid for the current hull object
+        cache = getattr(self, "_rngcache", None)
+        if cache is None or cache["hull"] is not self.hull:
+            cache = {"hull": self.hull}
+            self._rngcache = cache
+
+        if dist not in cache:
+            cache[dist] = [FireVector.addbuffer(self.hull, dist), None]
+        if prep:
+            if cache[dist][1] is None:
+                cache[dist][1] = prepare(cache[dist][0])
+            return cache[dist][1]
+        return cache[dist][0]
 
     def updatefhull(self, newlocs):
         """ Update the hull using old hull and new locs
         """
         import FireVector
 
-        hull = FireVector.cal_hull(newlocs, sensor=self.sensor)
-        # use the union to include hull in past time step
-        phull = self.hull
-        self.hull = phull.union(hull)
+        self._rngcache = None  # connecting ranges depend on hull
+
+        from FireConsts import opt_hullbudget, hull_maxvertices, hull_gridsize
+        from FireConsts import opt_rasterhull, rasterhull_minpix, rasterhull_res
+
+        # for very large fires, paint new pixels to the burned-cell bitmap and
+        #   derive the hull from the bitmap (if set)
+        hullbitmap = getattr(self, "hullbitmap", None)
+        if opt_rasterhull and (
+            hullbitmap is not None or self.n_pixels >= rasterhull_minpix
+        ):
+            if hullbitmap is None:  # start the bitmap using all pixels
+                hullbitmap = FireVector.paint_cells(None, self.locs, rasterhull_res)
+            self.hullbitmap = FireVector.paint_cells(
+                hullbitmap, newlocs, rasterhull_res
+            )
+            self.hull = FireVector.polygonize_cells(self.hullbitmap, rasterhull_res)
+        else:
+            hull = FireVector.cal_hull(newlocs, sensor=self.sensor)
+            # use the union to include hull in past time step
+            phull = self.hull
+            self.hull = phull.union(hull)
+
+        # keep the hull complexity bounded (snap to precision grid and simplify)
+        if opt_hullbudget:
+            self.hull = FireVector.bound_hull(self.hull, hull_maxvertices, hull_gridsize)
 
     def updateextpixels(self, newpixels):
         """ Update the external pixels
@@ -840,17 +1429,19 @@ class Cluster:
     """
 
     # initilization
-    def __init__(self, id, pixels, t, sensor="viirs"):
+    def __init__(self, id, pixels, t, sensor="viirs", hull=None):
         """ initilization
 
         Parameters
         ----------
         id : int
             cluster id number
-        pixels : 3-element list
-            (lat, lon, FRP) of AF pixels
+        pixels : Pixels
+            the AF pixels of the cluster
         t : tuple, (int,int,int,str)
             the year, month, day and 'AM'|'PM'
+        hull : geometry
+            precomputed hull of the pixels (None: calculated at first use)
         """
         from datetime import date
 
@@ -859,13 +1450,14 @@ class Cluster:
         self.id = id
         self.sensor = sensor
         self.pixels = pixels  # (x,y,FRP,...)
+        self._hull = hull  # cached hull
 
     # properties
     @property
     def locs(self):
-        """ List of pixel locations (lat,lon)
+        """ Pixel locations (x,y), np array (nx2)
         """
-        return [(p.x, p.y) for p in self.pixels]
+        return self.pixels.locs
 
     @property
     def centroid(self):
@@ -883,12 +1475,17 @@ class Cluster:
 
     @property
     def hull(self):
-        """ Fire concave hull (alpha shape)
+        """ Fire concave hull (alpha shape), calculated once and cached
         """
         import FireVector
 
-        hull = FireVector.cal_hull(self.locs, self.sensor)
-        return hull
+        if self._hull is None:
+            self._hull = FireVector.cal_hull(self.locs, self.sensor)
+        return self._hull
+
+    @hull.setter
+    def hull(self, hull):
+        self._hull = hull
 
     @property
     def b_box(self):
@@ -928,3 +1525,402 @@ class FirePixel:
     @property
     def loc_geo(self):
         return (self.lon, self.lat)
+
+
+
+# e. Object - PixelIndex
+class PixelIndex:
+    """ class of a persistent spatial index of recent fire pixels, which includes
+        locs : exterior pixel locations (x, y) of each indexed fire
+        parent : union-find forest of fire ids (a merged fire points to its target)
+    """
+
+    def __init__(self):
+        self.locs = {}  # fid -> np array (nx2) of pixel locations
+        self.parent = {}  # fid -> parent fid
+
+    @property
+    def fids(self):
+        """ List of indexed fire ids
+        """
+        return list(self.locs.keys())
+
+    def find(self, fid):
+        """ Find the root fire id (the fire that fid has been merged to)
+        """
+        parent = self.parent
+        root = fid
+        while parent.get(root, root) != root:
+            root = parent[root]
+        # compress the path
+        while fid != root:
+            parent[fid], fid = root, parent[fid]
+        return root
+
+    def union(self, fid_source, fid_target):
+        """ Record the merging of fire fid_source to fire fid_target
+        """
+        r_source = self.find(fid_source)
+        r_target = self.find(fid_target)
+        if r_source != r_target:
+            self.parent[r_source] = r_target
+        self.locs.pop(fid_source, None)
+
+    def update(self, fid, locs):
+        """ Set the pixel locations of fire fid
+        """
+        import numpy as np
+
+        self.parent.setdefault(fid, fid)
+        # keep a copy (locs may be a view into the pixel table, which is replaced when compacted)
+        self.locs[fid] = np.array(locs, dtype=float).reshape(-1, 2)
+
+    def prune(self, fids_keep):
+        """ Remove all fires not in fids_keep from the index
+        """
+        fids_keep = set(fids_keep)
+        for fid in self.fids:
+            if fid not in fids_keep:
+                del self.locs[fid]
+        self.parent = {
+            fid: p for fid, p in self.parent.items() if self.find(fid) in fids_keep
+        }
+
+    def query(self, locs, fidrngs):
+        """ Find the fire each new pixel is connected to
+        Parameters
+        ----------
+        locs : list (nx2)
+            x and y values of new fire pixels
+        fidrngs : dict
+            {fid: connecting distance (m)} of candidate fires
+        Returns
+        -------
+        fids : np array (n)
+            the smallest id of candidate fires within the connecting distance
+            of each pixel (-1 for pixels with no connected fire)
+        """
+        import numpy as np
+        import FireClustering
+
+        locs = np.asarray(locs, dtype=float).reshape(-1, 2)
+        fids = np.full(len(locs), -1, dtype=np.int64)
+
+        # collect pixel locations of candidate fires
+        cfids = [fid for fid in self.fids if self.find(fid) in fidrngs]
+        if (len(cfids) == 0) or (len(locs) == 0):
+            return fids
+        plocs = np.concatenate([self.locs[fid] for fid in cfids])
+        proots = np.repeat(
+            [self.find(fid) for fid in cfids], [len(self.locs[fid]) for fid in cfids]
+        )
+        prngs = np.array([fidrngs[r] for r in proots], dtype=float).reshape(-1)
+
+        # one fixed-radius search using the largest connecting distance
+        indptr, pj, d = FireClustering.grid_query_radius(plocs, prngs.max(), locs)
+        qi = np.repeat(np.arange(len(locs)), np.diff(indptr))
+
+        # keep pairs within the connecting distance of each fire
+        keep = d <= prngs[pj]
+        big = np.iinfo(np.int64).max
+        fidmin = np.full(len(locs), big, dtype=np.int64)
+        np.minimum.at(fidmin, qi[keep], proots[pj[keep]])
+        fids[fidmin < big] = fidmin[fidmin < big]
+
+        return fids
+
+
+# f. Object - PixelTable
+class PixelTable:
+    """ class of a columnar table of all fire pixels (owned by Allfires), which includes
+        data : np structured array (one row for each pixel) with columns
+            loc (x, y), loc_geo (lon, lat), frp, DS, DT, ampm, datetime, sat,
+            origin, fid (the fire the pixel currently belongs to),
+            t (half-day time step index of detection)
+        n : number of rows in use (data is allocated with spare capacity)
+    """
+
+    dtype = [
+        ("loc", "f8", (2,)),
+        ("loc_geo", "f8", (2,)),
+        ("frp", "f8"),
+        ("DS", "f8"),
+        ("DT", "f8"),
+        ("ampm", "U2"),
+        ("datetime", "M8[ns]"),
+        ("sat", "U10"),
+        ("origin", "i8"),
+        ("fid", "i8"),
+        ("t", "i8"),
+    ]
+
+    def __init__(self):
+        import numpy as np
+
+        self.data = np.zeros(0, dtype=self.dtype)
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    def __getstate__(self):
+        """ Drop the spare capacity before pickling
+        """
+        state = self.__dict__.copy()
+        state["data"] = self.data[: self.n].copy()
+        return state
+
+    def append(self, t, x, y, lon, lat, frp, DS, DT, ampm, datetime, sat, origin=-1):
+        """ Append pixels (all columns are arrays of the same length)
+        Parameters
+        ----------
+        t : tuple, (int,int,int,str)
+            the year, month, day and 'AM'|'PM' of detection
+        Returns
+        -------
+        pixels : Pixels
+            the appended pixels
+        """
+        import numpy as np
+        import FireTime
+
+        m = len(x)
+        if self.n + m > len(self.data):  # grow the table (double the capacity)
+            data = np.zeros(max(2 * len(self.data), self.n + m, 1024), dtype=self.dtype)
+            data[: self.n] = self.data[: self.n]
+            self.data = data
+
+        rows = range(self.n, self.n + m)
+        new = self.data[self.n : self.n + m]
+        new["loc"][:, 0], new["loc"][:, 1] = x, y
+        new["loc_geo"][:, 0], new["loc_geo"][:, 1] = lon, lat
+        new["frp"], new["DS"], new["DT"] = frp, DS, DT
+        new["ampm"], new["datetime"], new["sat"] = ampm, datetime, sat
+        new["origin"] = origin
+        new["fid"] = -1
+        new["t"] = FireTime.t2ti(t)
+        self.n += m
+        return Pixels(self, rows)
+
+    def append_afp(self, afp, t):
+        """ Append all active fire pixels read at a time step
+        Parameters
+        ----------
+        afp : DataFrame
+            active fire pixels (columns x, y, Lon, Lat, FRP, DS, DT, ampm,
+            YYYYMMDD_HHMM, Sat)
+        t : tuple, (int,int,int,str)
+            the year, month, day and 'AM'|'PM'
+        Returns
+        -------
+        pixels : Pixels
+            the appended pixels (in the order of afp)
+        """
+        return self.append(
+            t,
+            afp.x.values,
+            afp.y.values,
+            afp.Lon.values,
+            afp.Lat.values,
+            afp.FRP.values,
+            afp.DS.values,
+            afp.DT.values,
+            afp.ampm.values,
+            afp.YYYYMMDD_HHMM.values,
+            afp.Sat.values,
+        )
+
+    def set_fid(self, pixels, fid):
+        """ Record the fire the pixels belong to
+        """
+        for chunk in pixels.chunks:
+            self.data["fid"][Pixels._index(chunk)] = fid
+
+
+# g. Object - Pixels
+class Pixels:
+    """ class of a set of fire pixels, a view (row numbers) into a PixelTable
+        column accessors (locs, frp, ...) return arrays; iteration yields FirePixel objects
+
+        The row numbers are kept as an append-only list of chunks (a range of
+        rows or an array of row numbers). Adding two Pixels links their chunks
+        without copying the row numbers; the chunks are consolidated into one
+        array when all row numbers are needed.
+    """
+
+    def __init__(self, table, rows=None, chunks=None):
+        """ Initialize with row numbers (array-like or range) or a list of chunks
+        """
+        import numpy as np
+
+        self.table = table
+        if chunks is None:
+            if rows is None:
+                rows = range(0)
+            if not isinstance(rows, range):
+                rows = np.asarray(rows, dtype=np.int64)
+            chunks = [rows] if len(rows) > 0 else []
+        self.chunks = chunks
+        self.n = sum(len(c) for c in chunks)
+
+    def __len__(self):
+        return self.n
+
+    def __add__(self, other):
+        if isinstance(other, Pixels):
+            if len(other) == 0:
+                return self
+            if len(self) == 0:
+                return other
+            chunks = self.chunks[:-1]
+            last, first = self.chunks[-1], other.chunks[0]
+            if (
+                isinstance(last, range)
+                and isinstance(first, range)
+                and last.stop == first.start
+            ):  # adjacent ranges of rows are joined
+                chunks.append(range(last.start, first.stop))
+            else:
+                chunks += [last, first]
+            return Pixels(self.table, chunks=chunks + other.chunks[1:])
+        if len(other) == 0:  # e.g. an empty list
+            return self
+        return NotImplemented
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    @staticmethod
+    def _index(chunk):
+        """ Index (slice or array) of the table rows of a chunk
+        """
+        if isinstance(chunk, range):
+            return slice(chunk.start, chunk.stop)
+        return chunk
+
+    @property
+    def rows(self):
+        """ Row numbers of the pixels in the table, np array
+        """
+        import numpy as np
+
+        if len(self.chunks) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if len(self.chunks) > 1:  # consolidate the chunks
+            rows = [
+                np.arange(c.start, c.stop) if isinstance(c, range) else c
+                for c in self.chunks
+            ]
+            self.chunks = [np.concatenate(rows)]
+        rows = self.chunks[0]
+        if isinstance(rows, range):
+            return np.arange(rows.start, rows.stop)
+        return rows
+
+    def __getitem__(self, ind):
+        """ Subset of pixels (slice, mask or row positions), or a FirePixel for an integer
+        """
+        import numpy as np
+
+        if isinstance(ind, (int, np.integer)):
+            return self._firepixel(self.rows[ind])
+        if (
+            isinstance(ind, slice)
+            and ind.step in (None, 1)
+            and len(self.chunks) == 1
+            and isinstance(self.chunks[0], range)
+        ):  # a slice of a range of rows is a range
+            return Pixels(self.table, self.chunks[0][ind])
+        return Pixels(self.table, self.rows[ind])
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            for r in chunk:
+                yield self._firepixel(r)
+
+    def _firepixel(self, r):
+        d = self.table.data[r]
+        return FirePixel(
+            d["loc"][0],
+            d["loc"][1],
+            d["loc_geo"][0],
+            d["loc_geo"][1],
+            d["frp"],
+            d["DS"],
+            d["DT"],
+            d["ampm"],
+            d["datetime"],
+            d["sat"],
+            d["origin"],
+        )
+
+    def _col(self, name):
+        """ Column values of the pixels (a view if the rows are a single range)
+        """
+        if len(self.chunks) == 1:
+            return self.table.data[name][self._index(self.chunks[0])]
+        return self.table.data[name][self.rows]
+
+    @property
+    def locs(self):
+        """ Pixel locations (x, y), np array (nx2)
+        """
+        return self._col("loc")
+
+    @property
+    def locs_geo(self):
+        """ Pixel locations (lon, lat), np array (nx2)
+        """
+        return self._col("loc_geo")
+
+    @property
+    def x(self):
+        return self.locs[:, 0]
+
+    @property
+    def y(self):
+        return self.locs[:, 1]
+
+    @property
+    def lon(self):
+        return self.locs_geo[:, 0]
+
+    @property
+    def lat(self):
+        return self.locs_geo[:, 1]
+
+    @property
+    def frp(self):
+        return self._col("frp")
+
+    @property
+    def DS(self):
+        return self._col("DS")
+
+    @property
+    def DT(self):
+        return self._col("DT")
+
+    @property
+    def ampm(self):
+        return self._col("ampm")
+
+    @property
+    def datetime(self):
+        return self._col("datetime")
+
+    @property
+    def sat(self):
+        return self._col("sat")
+
+    @property
+    def origin(self):
+        return self._col("origin")
+
+    @property
+    def fid(self):
+        return self._col("fid")
+
+    @property
+    def t(self):
+        return self._col("t")
@@ -8,9 +8,13 @@ The following functions are used to convert times between different formats.
     d : date, datetime.date()
     ampm : ampm, str()
     dt : time steps, datetime.datetime()
+    ti : time steps, int (half-day index: half days since 1970-01-01 AM)
 
 """
 
+# date ordinal of the start (1970-01-01 AM) of the half-day index
+ORD_TI0 = 719163
+
 
 def t_nb(t, nb="next"):
     """ Calculate the next or previous time step (year, month, day, ampm)
@@ -26,31 +30,11 @@ def t_nb(t, nb="next"):
     t_out : tuple, (int,int,int,str)
         the year, month, day and 'AM'|'PM' for next/previous time
     """
-    from datetime import date, timedelta
-
-    # the next time step
+    # the next or previous time step using the half-day index
     if nb == "next":
-        # if current time is 'AM', set next time as the current day and 'PM'
-        if t[-1] == "AM":
-            t_out = list(t[:-1])
-            t_out.append("PM")
-        # if current time is 'PM', set next time as the following day and 'AM'
-        else:
-            d = date(*t[:-1])
-            d_out = d + timedelta(days=1)
-            t_out = [d_out.year, d_out.month, d_out.day, "AM"]
-
-    # the previous time step
+        t_out = ti2t(t2ti(t) + 1)
     elif nb == "previous":
-        # if current time is 'PM', set previous time as the current day and 'AM'
-        if t[-1] == "PM":
-            t_out = list(t[:-1])
-            t_out.append("AM")
-        # if current time is 'AM', set previous time as the previous day and 'PM'
-        else:
-            d = date(*t[:-1])
-            d_out = d + timedelta(days=-1)
-            t_out = [d_out.year, d_out.month, d_out.day, "PM"]
+        t_out = ti2t(t2ti(t) - 1)
     return t_out
 
 
@@ -68,19 +52,25 @@ def t_dif(t1, t2):
     dt : float
         time difference in days (t2-t1), half day as 0.5
     """
-    from datetime import date
+    return ti_dif(t2ti(t1), t2ti(t2))
 
-    # calculate the day difference
-    d1 = date(*t1[:-1])
-    d2 = date(*t2[:-1])
-    dt = (d2 - d1).days
-
-    # adjust according to ampm difference
-    if t1[-1] != t2[-1]:
-        if t1[-1] == "PM":
-            dt -= 0.5
-        else:
-            dt += 0.5
+
+def ti_dif(ti1, ti2):
+    """ calculate the time difference between two half-day indices
+    Parameters
+    ----------
+    ti1 : int
+        half-day index of time 1
+    ti2 : int
+        half-day index of time 2
+
+    Returns
+    -------
+    dt : int or float
+        time difference in days (ti2-ti1), half day as 0.5
+    """
+    dti = ti2 - ti1
+    dt = dti // 2 if dti % 2 == 0 else dti / 2
     return dt
 
 def dt_dif(dt1,dt2):
@@ -211,3 +201,56 @@ def isyearst(t):
         return True
     else:
         return False
+
+
+def t2ti(t):
+    """ convert a t tuple to the half-day index
+    Parameters
+    ----------
+    t : tuple, (int,int,int,str)
+        the year, month, day and 'AM'|'PM'
+
+    Returns
+    -------
+    ti : int
+        half days since 1970-01-01 AM
+    """
+    from datetime import date
+
+    return 2 * (date(*t[:3]).toordinal() - ORD_TI0) + (t[3] == "PM")
+
+
+def ti2t(ti):
+    """ convert the half-day index to a t tuple
+    Parameters
+    ----------
+    ti : int
+        half days since 1970-01-01 AM
+
+    Returns
+    -------
+    t : list, (int,int,int,str)
+        the year, month, day and 'AM'|'PM'
+    """
+    from datetime import date
+
+    d = date.fromordinal(int(ti) // 2 + ORD_TI0)
+    return [d.year, d.month, d.day, ("AM", "PM")[int(ti) % 2]]
+
+
+def ti2dt64(ti):
+    """ convert half-day indices to datetime64 (vectorized)
+    Parameters
+    ----------
+    ti : int or np array of int
+        half days since 1970-01-01 AM
+
+    Returns
+    -------
+    dt : np datetime64 or np array of datetime64
+        the start time (hour 0 or 12) of each time step
+    """
+    import numpy as np
+
+    return np.datetime64(0, "h") + np.asarray(ti, dtype=np.int64) * np.timedelta64(12, "h")
+
@@ -17,63 +17,46 @@ def alpha_shape(points, alpha):
     from shapely.ops import cascaded_union, polygonize
     from scipy.spatial import Delaunay
     import numpy as np
-    import math
     import shapely.geometry as geometry
 
     if len(points) < 4:
         # When you have a triangle, there is no sense in computing an alpha shape.
         return geometry.MultiPoint(list(points)).convex_hull
 
-    def add_edge(edges, edge_points, coords, i, j):
-        """
-        Add a line between the i-th and j-th points,
-        if not in the list already
-        """
-        if (i, j) in edges or (j, i) in edges:
-            # already added
-            return
-        edges.add((i, j))
-        edge_points.append(coords[[i, j]])
-
     coords = np.array([point for point in points])
     tri = Delaunay(coords)
-    edges = set()
-    edge_points = []
-
-    # loop over triangles:
-    # ia, ib, ic = indices of corner points of the
-    # triangle
-    # for ia, ib, ic in tri.vertices:
-    for ia, ib, ic in tri.vertices:
-        pa = coords[ia]
-        pb = coords[ib]
-        pc = coords[ic]
-        # Lengths of sides of triangle
-        a = math.sqrt((pa[0] - pb[0]) ** 2 + (pa[1] - pb[1]) ** 2)
-        b = math.sqrt((pb[0] - pc[0]) ** 2 + (pb[1] - pc[1]) ** 2)
-        c = math.sqrt((pc[0] - pa[0]) ** 2 + (pc[1] - pa[1]) ** 2)
-        # Semiperimeter of triangle
-        s = (a + b + c) / 2.0
-
-        # Area of triangle by Heron's formula
-        try:
-            area = math.sqrt(s * (s - a) * (s - b) * (s - c))
-        except:
-            area = 0
-
-        if area > 0:  # modified by YC
-            circum_r = a * b * c / (4.0 * area)
-        else:
-            circum_r = 0
-        # Here's the radius filter.
-        # print circum_r
-        # if circum_r < 1.0/alpha:
-        if circum_r < alpha:
-            add_edge(edges, edge_points, coords, ia, ib)
-            add_edge(edges, edge_points, coords, ib, ic)
-            add_edge(edges, edge_points, coords, ic, ia)
-    m = geometry.MultiLineString(edge_points)
-    triangles = list(polygonize(m))
+
+    # corner points of all triangles (ia, ib, ic = indices of corner points)
+    ia, ib, ic = tri.simplices.T
+    pa, pb, pc = coords[ia], coords[ib], coords[ic]
+
+    # Lengths of sides of triangles
+    a = np.sqrt((pa[:, 0] - pb[:, 0]) ** 2 + (pa[:, 1] - pb[:, 1]) ** 2)
+    b = np.sqrt((pb[:, 0] - pc[:, 0]) ** 2 + (pb[:, 1] - pc[:, 1]) ** 2)
+    c = np.sqrt((pc[:, 0] - pa[:, 0]) ** 2 + (pc[:, 1] - pa[:, 1]) ** 2)
+    # Semiperimeter of triangles
+    s = (a + b + c) / 2.0
+
+    # Area of triangles by Heron's formula (degenerate triangles get area 0)
+    area = np.sqrt(np.clip(s * (s - a) * (s - b) * (s - c), 0, None))
+    circum_r = np.zeros(len(area))
+    pos = area > 0  # modified by YC
+    circum_r[pos] = a[pos] * b[pos] * c[pos] / (4.0 * area[pos])
+
+    # Here's the radius filter.
+    # if circum_r < 1.0/alpha:
+    keep = circum_r < alpha
+
+    # edges (ia,ib), (ib,ic), (ic,ia) of kept triangles, each edge added only once
+    #   (in order of first appearance)
+    edges = np.stack(
+        [ia[keep], ib[keep], ib[keep], ic[keep], ic[keep], ia[keep]], axis=1
+    ).reshape(-1, 2)
+    _, first = np.unique(np.sort(edges, axis=1), axis=0, return_index=True)
+    edges = edges[np.sort(first)]
+    edge_points = list(coords[edges])
+
+    triangles = list(polygonize(edge_points))
 
     # return triangles, edge_points
     return cascaded_union(triangles), edge_points
@@ -100,6 +83,52 @@ def addbuffer(geom_ll, vbuf):
     return geom_ll.buffer(vbuf)
 
 
+def rng_intersects(rng, geom, dist=None):
+    """ determine if a geometry is within a connecting range
+    Parameters
+    ----------
+    rng : geometry | PreparedGeometry
+        the connecting range (buffered hull), or the hull itself if dist is set
+    geom : geometry
+        the geometry to test
+    dist : float
+        the connecting distance (m) from the hull (None: rng is already buffered)
+    Returns
+    -------
+    within : bool
+        True if geom touches the connecting range
+    """
+    if dist is None:
+        return rng.intersects(geom)
+    return rng.distance(geom) <= dist
+
+
+def rng_intersects_bulk(rngs, geoms, dists=None):
+    """ determine element-wise if geometries are within paired connecting ranges
+    Parameters
+    ----------
+    rngs : list of geometry | PreparedGeometry
+        the connecting ranges (see rng_intersects)
+    geoms : list of geometry
+        the geometries to test, one for each range
+    dists : list of float
+        the connecting distance for each range (None: ranges are already buffered)
+    Returns
+    -------
+    within : np array of bool
+        True for each pair where geom touches the connecting range
+    """
+    import numpy as np
+
+    if dists is None:
+        dists = [None] * len(rngs)
+    return np.fromiter(
+        (rng_intersects(rng, geom, dist) for rng, geom, dist in zip(rngs, geoms, dists)),
+        dtype=bool,
+        count=len(rngs),
+    )
+
+
 def doMultP(locs, buf):
     """ deirvve a MultipPolygon (bufferred MultiPoint) shape from given fire locations
     Parameters
@@ -191,6 +220,102 @@ def doConcH(locs, buf, alpha=100):
         return None
 
 
+def paint_cells(bitmap, locs, res):
+    """ paint fire pixel locations onto a burned-cell bitmap (the bitmap grows as needed)
+    Parameters
+    ----------
+    bitmap : tuple (np array, int, int) | None
+        the burned-cell bitmap (cells, column index of cells[:,0], row index of
+        cells[0,:]); None to start a new bitmap
+    locs : list (nx2)
+        x and y values of fire pixels
+    res : float
+        cell size (m)
+    Returns
+    -------
+    bitmap : tuple (np array, int, int)
+        the updated bitmap
+    """
+    import numpy as np
+
+    locs = np.asarray(locs, dtype=float).reshape(-1, 2)
+    ix = np.floor(locs[:, 0] / res).astype(np.int64)
+    iy = np.floor(locs[:, 1] / res).astype(np.int64)
+    if bitmap is None:
+        if len(locs) == 0:
+            return None
+        cells, ix0, iy0 = np.zeros((1, 1), dtype=bool), ix.min(), iy.min()
+    else:
+        cells, ix0, iy0 = bitmap
+
+    # grow the bitmap if new cells fall outside its extent
+    if len(locs) > 0:
+        ix0n, iy0n = min(ix0, ix.min()), min(iy0, iy.min())
+        ix1n = max(ix0 + cells.shape[1], ix.max() + 1)
+        iy1n = max(iy0 + cells.shape[0], iy.max() + 1)
+        if (ix0n, iy0n) != (ix0, iy0) or (iy1n - iy0n, ix1n - ix0n) != cells.shape:
+            grown = np.zeros((iy1n - iy0n, ix1n - ix0n), dtype=bool)
+            grown[
+                iy0 - iy0n : iy0 - iy0n + cells.shape[0],
+                ix0 - ix0n : ix0 - ix0n + cells.shape[1],
+            ] = cells
+            cells, ix0, iy0 = grown, ix0n, iy0n
+
+    cells[iy - iy0, ix - ix0] = True
+    return cells, ix0, iy0
+
+
+def polygonize_cells(bitmap, res):
+    """ derive the hull polygon of a burned-cell bitmap (one-cell gaps are closed)
+    Parameters
+    ----------
+    bitmap : tuple (np array, int, int)
+        the burned-cell bitmap (see paint_cells)
+    res : float
+        cell size (m)
+    Returns
+    -------
+    hull : Polygon or MultiPolygon object
+        calculated hull shape
+    """
+    from rasterio.features import shapes
+    from rasterio.transform import Affine
+    from scipy.ndimage import binary_closing
+    from shapely.geometry import shape
+    from shapely.ops import unary_union
+    import numpy as np
+
+    cells, ix0, iy0 = bitmap
+
+    # close one-cell gaps between burned cells (pad to avoid edge erosion)
+    closed = binary_closing(np.pad(cells, 1), structure=np.ones((3, 3)))
+    closed = closed.astype(np.uint8)
+
+    # vectorize the burned cells
+    transform = Affine(res, 0, (ix0 - 1) * res, 0, res, (iy0 - 1) * res)
+    polys = [
+        shape(geom)
+        for geom, v in shapes(closed, mask=closed.astype(bool), transform=transform)
+    ]
+    return unary_union(polys)
+
+
+def cal_hull_raster(fp_locs, res):
+    """ calculate the hull of fire locations using a burned-cell bitmap
+    Parameters
+    ----------
+    fp_locs : list (nx2)
+        x and y values of all fire pixels
+    res : float
+        cell size (m)
+    Returns
+    -------
+    hull : Polygon or MultiPolygon object
+        calculated hull shape
+    """
+    return polygonize_cells(paint_cells(None, fp_locs, res), res)
+
+
 def cal_hull(fp_locs, sensor="viirs"):
     """ wrapper to calculate the hull given fire locations.
         the returned hull type depends on the pixel number
@@ -204,7 +329,7 @@ def cal_hull(fp_locs, sensor="viirs"):
         calculated hull (a buffer of VIIRS half pixel size included)
     """
     from FireConsts import valpha, VIIRSbuf  # ,MCD64buf
-    import numpy as np
+    from FireConsts import opt_rasterhull, rasterhull_minpix, rasterhull_res
 
     # set buffer according to sensor
     if sensor == "viirs":
@@ -217,8 +342,11 @@ def cal_hull(fp_locs, sensor="viirs"):
     # number of points
     nfp = len(fp_locs)
 
+    # For very large cluster, calculate hull using a burned-cell bitmap (if set)
+    if opt_rasterhull and nfp >= rasterhull_minpix:
+        hull = cal_hull_raster(fp_locs, rasterhull_res)
     # For cluster with 1-2 pixel, calculate hull using buffered points (MultiPolygon)
-    if nfp < 3:
+    elif nfp < 3:
         hull = doMultP(fp_locs, buf)
     # For cluster with 3 pixels, calculate hull using convex hull
     elif nfp == 3:  # call doConvH to get the hull
@@ -241,43 +369,241 @@ def cal_hull(fp_locs, sensor="viirs"):
             hull = doMultP(fp_locs, buf)
         elif hull.area == 0:
             hull = doMultP(fp_locs, buf)
+
     return hull
 
 
+def cal_hulls_batch(list_of_locs, sensor="viirs", nproc=None):
+    """ calculate the hulls of many clusters (e.g., all new clusters in a time step) at once
+        single pixel clusters are built from a translated template of the buffered point,
+        clusters with at least hullpool_minpix pixels can be sent to a process pool
+    Parameters
+    ----------
+    list_of_locs : list of list (nx2)
+        locations of fire pixels for each cluster
+    sensor : str
+        'viirs' | 'mcd64'
+    nproc : int
+        number of processes for large clusters (None: use hullpool_nproc)
+    Returns
+    -------
+    hulls : list
+        calculated hulls (same as cal_hull) for each cluster
+    """
+    from FireConsts import VIIRSbuf, MCD64buf, hullpool_minpix, hullpool_nproc
+    from shapely.geometry import Point, Polygon
+    import numpy as np
+
+    if nproc is None:
+        nproc = hullpool_nproc
+    buf = MCD64buf if sensor == "mcd64" else VIIRSbuf
+
+    hulls = [None] * len(list_of_locs)
+    nfps = np.array([len(locs) for locs in list_of_locs])
+
+    # single pixel clusters: translate the exterior of a buffered point at the origin
+    ids_1 = np.flatnonzero(nfps == 1)
+    if len(ids_1) > 0:
+        template = np.asarray(addbuffer(Point(0, 0), buf).exterior.coords)
+        locs_1 = np.array([list_of_locs[i][0] for i in ids_1], dtype=float)
+        for i, loc in zip(ids_1, locs_1):
+            hulls[i] = Polygon(template + loc)
+
+    # large clusters: use a process pool (if set)
+    ids_large = np.flatnonzero(nfps >= hullpool_minpix) if nproc > 1 else []
+    if len(ids_large) > 1:
+        from multiprocessing import Pool
+        from functools import partial
+
+        with Pool(min(nproc, len(ids_large))) as pool:
+            hulls_large = pool.map(
+                partial(cal_hull, sensor=sensor),
+                [list_of_locs[i] for i in ids_large],
+            )
+        for i, hull in zip(ids_large, hulls_large):
+            hulls[i] = hull
+
+    # other clusters: calculate the hull one by one
+    for i, locs in enumerate(list_of_locs):
+        if hulls[i] is None:
+            hulls[i] = cal_hull(locs, sensor=sensor)
+    return hulls
+
+
+def count_vertices(geom):
+    """ count the number of vertices of a (Multi)Polygon (exteriors and holes)
+    Parameters
+    ----------
+    geom : geometry, 'Polygon' | 'MultiPolygon'
+        the hull for the fire
+    Returns
+    -------
+    nv : int
+        number of vertices
+    """
+    if geom is None or geom.is_empty:
+        return 0
+    if geom.type == "Polygon":
+        return len(geom.exterior.coords) + sum(len(r.coords) for r in geom.interiors)
+    elif geom.type == "MultiPolygon":
+        return sum(count_vertices(g) for g in geom.geoms)
+    else:
+        return len(geom.coords) if hasattr(geom, "coords") else 0
+
+
+def bound_hull(hull, maxvertices, gridsize):
+    """ snap hull coordinates to a precision grid and simplify the hull
+        (topology preserved) until its number of vertices is within a budget;
+        the simplified hull covers the snapped hull
+    Parameters
+    ----------
+    hull : geometry, 'Polygon' | 'MultiPolygon'
+        the hull for the fire
+    maxvertices : int
+        the vertex budget
+    gridsize : float
+        the precision grid (m)
+    Returns
+    -------
+    hull : geometry, 'Polygon' | 'MultiPolygon'
+        the snapped and simplified hull
+    """
+    from shapely.ops import transform
+    import numpy as np
+
+    if hull is None or hull.is_empty:
+        return hull
+
+    # snap coordinates to the precision grid (buffer(0) repairs collapsed parts)
+    if gridsize > 0:
+        hull = transform(
+            lambda x, y: (np.round(np.asarray(x) / gridsize) * gridsize,
+                          np.round(np.asarray(y) / gridsize) * gridsize),
+            hull,
+        ).buffer(0)
+
+    # simplify with increasing tolerance until the vertex budget is met; the
+    #   simplified hull is grown by the tolerance (with mitred corners, which
+    #   add no vertices) so that it still covers the whole hull
+    tol = max(gridsize, 1.0)
+    bounded = hull
+    while count_vertices(bounded) > maxvertices and tol < 1e5:
+        bounded = hull.simplify(tol, preserve_topology=True).buffer(tol, join_style=2)
+        tol *= 2
+    return bounded
+
+
 def cal_extpixels(fps, hull, alpha=100):
     """ calculate the exterior pixels around a hull
     Parameters
     ----------
-    fps : list (nx3)
-        list of all fire pixels
+    fps : Pixels
+        all fire pixels
     hull : geometry, 'Polygon' | 'MultiPoint'
         the existing hull for the fire
     alpha : int
         alpha value (1/deg) to define the inward buffer
     Returns
     -------
-    fps_ext : list (nx2)
+    fps_ext : Pixels
         the exterior fire pixels for the fire
     """
-    from shapely.geometry import Point
+    from shapely import vectorized
     from FireConsts import extbuffer
 
     # use alpha to define an inward buffer and an interior part of the hull
     # hts_buf = hull.buffer(-1/alpha)
     hts_buf = addbuffer(hull, -extbuffer)
 
-    # loop over all pixel locations in fps to determine exterior pixels
-    fps_ext = []
-    for fp in fps:
-        # point locations of each pixel (fp.oc[0]:lat, fp.loc[1]:lon)
-        pt = Point(fp.loc[0], fp.loc[1])
+    # no interior part of the hull, all pixels are exterior pixels
+    if len(fps) == 0 or hts_buf.is_empty:
+        return fps
+
+    # point locations of all pixels (x, y)
+    locs = fps.locs
 
-        # exclude points in interior part of the hull
-        if not hts_buf.contains(pt):
-            fps_ext.append(fp)
+    # exclude points in interior part of the hull (array point-in-polygon test)
+    inside = vectorized.contains(hts_buf, locs[:, 0], locs[:, 1])
+    fps_ext = fps[~inside]
     return fps_ext
 
 
+def near_boundary(hull, locs, dist):
+    """ determine which locations are within a distance of the hull exterior(s)
+        (equivalent to testing the points against the buffered exterior(s),
+        using point-to-segment distances of candidate pairs from a KD-tree
+        for all but small polygon parts)
+    Parameters
+    ----------
+    hull : geometry, 'Polygon' | 'MultiPolygon'
+        the hull for the fire
+    locs : list (nx2)
+        x and y values of the points
+    dist : float
+        the distance (m)
+    Returns
+    -------
+    near : np array of bool (n)
+        True if the point is closer than dist to the exterior of the hull
+    """
+    from scipy.spatial import cKDTree
+    from shapely import vectorized
+    import numpy as np
+
+    locs = np.asarray(locs, dtype=float).reshape(-1, 2)
+    near = np.zeros(len(locs), dtype=bool)
+    if len(locs) == 0:
+        return near
+
+    # small parts (e.g. buffered 1-2 pixels) are tested against the buffered
+    #   exterior; this keeps the hole the buffer leaves inside rings smaller than dist
+    polys = hull.geoms if hull.type == "MultiPolygon" else [hull]
+    polys = [p for p in polys if not p.is_empty]
+    rings = []
+    for p in polys:
+        minx, miny, maxx, maxy = p.bounds
+        if max(maxx - minx, maxy - miny) < 4 * dist:
+            near |= vectorized.contains(
+                addbuffer(p.exterior, dist), locs[:, 0], locs[:, 1]
+            )
+        else:
+            rings.append(np.asarray(p.exterior.coords)[:, :2])
+    if len(rings) == 0:
+        return near
+
+    # boundary segments of all other exterior rings
+    A = np.concatenate([r[:-1] for r in rings])
+    B = np.concatenate([r[1:] for r in rings])
+
+    # split long segments (for the index only) so that a segment within dist of
+    #   a point always has its midpoint within dist + dist/2 of that point
+    nsub = np.maximum(np.ceil(np.hypot(*(B - A).T) / dist), 1).astype(np.int64)
+    iseg = np.repeat(np.arange(len(A)), nsub)
+    k = np.arange(len(iseg)) - np.repeat(np.cumsum(nsub) - nsub, nsub)
+    frac0, frac1 = k / nsub[iseg], (k + 1) / nsub[iseg]
+    SA = A[iseg] + (B[iseg] - A[iseg]) * frac0[:, None]
+    SB = A[iseg] + (B[iseg] - A[iseg]) * frac1[:, None]
+
+    # candidate (point, sub-segment) pairs
+    pairs = cKDTree(locs).sparse_distance_matrix(
+        cKDTree((SA + SB) / 2), 1.5 * dist, output_type="ndarray"
+    )
+    if len(pairs) == 0:
+        return near
+    ip, js = pairs["i"], pairs["j"]
+
+    # exact point-to-segment distances of the candidate pairs
+    P, a, b = locs[ip], SA[js], SB[js]
+    ab = b - a
+    L2 = (ab ** 2).sum(axis=1)
+    u = np.where(L2 > 0, ((P - a) * ab).sum(axis=1) / np.where(L2 > 0, L2, 1), 0)
+    u = np.clip(u, 0, 1)
+    d = np.hypot(*(P - (a + ab * u[:, None])).T)
+
+    near[ip[d < dist]] = True
+    return near
+
+
 def calConcHarea(hull):
     """ calculate area given the concave hull (km2)
     Parameters
@@ -0,0 +1,44 @@
+""" Benchmark of the exterior pixel classification (FireVector.cal_extpixels)
+
+Compares the array point-in-polygon test with the original loop over
+shapely Points (tests/baseline.py) for fires of 10k and 100k pixels, and
+checks that both give the same exterior pixels.
+
+Usage: python benchmarks/bench_extpixels.py
+"""
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+sys.path.insert(0, os.path.join(root, "tests"))
+
+import numpy as np
+from shapely.geometry import MultiPoint
+
+import FireVector
+import baseline
+from helpers import make_pixels
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    print(f"{'n':>8} {'n_ext':>7} {'loop (s)':>9} {'array (s)':>10} {'speedup':>8} same")
+    for n in [10000, 100000]:
+        fps = make_pixels(rng.normal(size=(n, 2)) * np.sqrt(n) * 200)
+        hull = MultiPoint(fps.locs).convex_hull
+
+        t0 = time.perf_counter()
+        ext0 = baseline.cal_extpixels(fps, hull)
+        t1 = time.perf_counter()
+        ext = FireVector.cal_extpixels(fps, hull)
+        t2 = time.perf_counter()
+
+        same = np.array_equal(
+            ext.locs.reshape(-1, 2), np.array([p.loc for p in ext0]).reshape(-1, 2)
+        )
+        print(
+            f"{n:>8} {len(ext):>7} {t1 - t0:>9.3f} {t2 - t1:>10.4f} "
+            f"{(t1 - t0) / (t2 - t1):>8.0f} {same}"
+        )
@@ -0,0 +1,56 @@
+""" Benchmark of the neighbor search backends used for fire pixel clustering
+
+Compares FireClustering.compute_all_spatial_distances with the BallTree and
+the grid-hash backends at 1k, 10k and 100k pixels (clustered like fire
+detections), and checks that both give the same neighbors.
+
+Usage: python benchmarks/bench_neighbors.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+import FireClustering
+
+
+def make_pixels(n, rng):
+    """ n pixel locations (m) in blobs of ~200 pixels scattered over 2000 km
+    """
+    nc = max(1, n // 200)
+    cen = rng.uniform(0, 2e6, (nc, 2))
+    X = cen[rng.integers(0, nc, n)] + rng.normal(0, 1500, (n, 2))
+    return pd.DataFrame(X, columns=["x", "y"])
+
+
+def timeit(func, *args, repeat=3, **kwargs):
+    """ best time (s) of several calls, and the result of the last call
+    """
+    best = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, res
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    print(f"{'n':>8} {'balltree (s)':>13} {'grid (s)':>10} {'speedup':>8} same")
+    for n in [1000, 10000, 100000]:
+        df = make_pixels(n, rng)
+        tb, (bptr, binds, _) = timeit(
+            FireClustering.compute_all_spatial_distances, df, 0.7, method="balltree"
+        )
+        tg, (gptr, ginds, _) = timeit(
+            FireClustering.compute_all_spatial_distances, df, 0.7, method="grid"
+        )
+        same = np.array_equal(bptr, gptr) and all(
+            np.array_equal(np.sort(binds[a:b]), np.sort(ginds[a:b]))
+            for a, b in zip(bptr[:-1], bptr[1:])
+        )
+        print(f"{n:>8} {tb:>13.4f} {tg:>10.4f} {tb / tg:>8.1f} {same}")
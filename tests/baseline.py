@@ -0,0 +1,201 @@
+""" baseline
+Reference copies of the original (pure Python) implementations, used by the
+parity tests to check that the optimized functions give the same results
+"""
+
+
+def remove_self(inds, dist):
+    """ Remove self from the index and distance arrays (FireClustering)
+    """
+    import numpy as np
+
+    new_inds = []
+    new_dist = []
+    for i in range(len(inds)):
+        pos = np.where(inds[i] == i)
+        new_inds.append(np.delete(inds[i], pos))
+        new_dist.append(np.delete(dist[i], pos))
+
+    return np.array(new_inds, dtype=object), np.array(new_dist, dtype=object)
+
+
+def compute_all_spatial_distances(data, max_thresh_km):
+    """ Derive neighbors (and distances) for each point using a BallTree (FireClustering)
+    """
+    import numpy as np
+    from sklearn.neighbors import BallTree
+
+    x = data.x.values
+    y = data.y.values
+
+    X = np.stack([x, y], axis=-1)
+
+    bt = BallTree(X, leaf_size=20)
+
+    inds, dist = bt.query_radius(X, r=max_thresh_km * 1000, return_distance=True)
+    inds, dist = remove_self(inds, dist)
+    return inds, dist * 1000
+
+
+def do_clustering(data, max_thresh_km):
+    """ Do initial clustering for fire pixels (FireClustering)
+    """
+    import numpy as np
+    import pandas as pd
+
+    # value to fill in pixels without clustering
+    NO_CLUSTER_VAL = -1
+
+    # if number of points is 1 or 2, each point is one cluster
+    num_points = len(data)
+    if num_points < 3:
+        cluster_id = list(range(num_points))
+        return cluster_id
+
+    # convert list to pd DataFrame
+    dfdata = pd.DataFrame(data, columns=["x", "y"])
+
+    # initialization
+    cluster_id_counter = 0
+    point_to_cluster_id = np.full(num_points, fill_value=NO_CLUSTER_VAL, dtype=np.int64)
+
+    # compute and sort neighbor pixels for each pixel
+    neighbor_inds, neighbor_spatial_dists = compute_all_spatial_distances(
+        dfdata, max_thresh_km
+    )
+
+    # include all possible pixels in cluster
+    to_check = np.full(num_points, fill_value=1, dtype=np.int8)
+    while np.sum(to_check) > 0:
+        start_ind = np.argmax(to_check == 1)  # catch first index to check
+
+        neighbors_to_search = list(neighbor_inds[start_ind])
+        all_neighbors = neighbors_to_search
+
+        if (
+            len(all_neighbors) == 0
+        ):  # if no neighbor, record the current pixel as a separate cluster
+            point_to_cluster_id[start_ind] = cluster_id_counter
+            cluster_id_counter += 1
+            to_check[start_ind] = 0
+
+        else:  # if with neighbor, record all neighbors
+            # find all neighbours of neighbours:
+            searched_neighbours = [start_ind]
+            while len(neighbors_to_search) > 0:
+                # take the first of these
+                px = neighbors_to_search[0]
+                searched_neighbours.append(px)
+                px_neighbors = list(neighbor_inds[px])
+                all_neighbors = list(set(all_neighbors + px_neighbors))
+                neighbors_to_search = list(
+                    set(all_neighbors).difference(searched_neighbours)
+                )
+            # now we have all pixels in this cluster in all_neighbors
+            point_to_cluster_id[all_neighbors] = cluster_id_counter
+            cluster_id_counter += 1
+            to_check[all_neighbors] = 0
+
+    return point_to_cluster_id.tolist()
+
+
+def alpha_shape(points, alpha):
+    """ Compute the alpha shape (concave hull) of a set of points (FireVector)
+        (Delaunay.vertices is used as Delaunay.simplices, its name in newer scipy)
+    """
+    from shapely.ops import cascaded_union, polygonize
+    from scipy.spatial import Delaunay
+    import numpy as np
+    import math
+    import shapely.geometry as geometry
+
+    if len(points) < 4:
+        # When you have a triangle, there is no sense in computing an alpha shape.
+        return geometry.MultiPoint(list(points)).convex_hull
+
+    def add_edge(edges, edge_points, coords, i, j):
+        """
+        Add a line between the i-th and j-th points,
+        if not in the list already
+        """
+        if (i, j) in edges or (j, i) in edges:
+            # already added
+            return
+        edges.add((i, j))
+        edge_points.append(coords[[i, j]])
+
+    coords = np.array([point for point in points])
+    tri = Delaunay(coords)
+    edges = set()
+    edge_points = []
+
+    # loop over triangles:
+    # ia, ib, ic = indices of corner points of the
+    # triangle
+    for ia, ib, ic in tri.simplices:
+        pa = coords[ia]
+        pb = coords[ib]
+        pc = coords[ic]
+        # Lengths of sides of triangle
+        a = math.sqrt((pa[0] - pb[0]) ** 2 + (pa[1] - pb[1]) ** 2)
+        b = math.sqrt((pb[0] - pc[0]) ** 2 + (pb[1] - pc[1]) ** 2)
+        c = math.sqrt((pc[0] - pa[0]) ** 2 + (pc[1] - pa[1]) ** 2)
+        # Semiperimeter of triangle
+        s = (a + b + c) / 2.0
+
+        # Area of triangle by Heron's formula
+        try:
+            area = math.sqrt(s * (s - a) * (s - b) * (s - c))
+        except:
+            area = 0
+
+        if area > 0:  # modified by YC
+            circum_r = a * b * c / (4.0 * area)
+        else:
+            circum_r = 0
+        # Here's the radius filter.
+        if circum_r < alpha:
+            add_edge(edges, edge_points, coords, ia, ib)
+            add_edge(edges, edge_points, coords, ib, ic)
+            add_edge(edges, edge_points, coords, ic, ia)
+    m = geometry.MultiLineString(edge_points)
+    triangles = list(polygonize(m))
+
+    return cascaded_union(triangles), edge_points
+
+
+def cal_extpixels(fps, hull, alpha=100):
+    """ calculate the exterior pixels around a hull, one pixel at a time (FireVector)
+    """
+    from shapely.geometry import Point
+    from FireConsts import extbuffer
+    from FireVector import addbuffer
+
+    # use alpha to define an inward buffer and an interior part of the hull
+    hts_buf = addbuffer(hull, -extbuffer)
+
+    # loop over all pixel locations in fps to determine exterior pixels
+    fps_ext = []
+    for fp in fps:
+        # point locations of each pixel (fp.oc[0]:lat, fp.loc[1]:lon)
+        pt = Point(fp.loc[0], fp.loc[1])
+
+        # exclude points in interior part of the hull
+        if not hts_buf.contains(pt):
+            fps_ext.append(fp)
+    return fps_ext
+
+
+def flinepixels(nps, fhull, fpbuffer):
+    """ select the pixels near the hull exterior(s) with buffered exteriors (Fire.flinepixels)
+    """
+    from shapely.geometry import Point, MultiLineString
+    from FireVector import addbuffer
+
+    if fhull.type == "Polygon":
+        lr = addbuffer(fhull.exterior, fpbuffer)
+        return [p for p in nps if lr.contains(Point(p.loc[0], p.loc[1]))]
+    elif fhull.type == "MultiPolygon":
+        mlr = MultiLineString([x.exterior for x in fhull.geoms])
+        mlr = addbuffer(mlr, fpbuffer)
+        return [p for p in nps if mlr.contains(Point(p.loc[0], p.loc[1]))]
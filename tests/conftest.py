@@ -0,0 +1,6 @@
+""" pytest configuration: make the FEDS modules in the repository root importable
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
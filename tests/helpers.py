@@ -0,0 +1,26 @@
+""" helpers
+Shared fixture generators, used by the tests and the benchmarks
+"""
+
+
+def make_pixels(locs):
+    """ Pixels (in a new PixelTable) at the locations locs (nx2)
+    """
+    import numpy as np
+    import pandas as pd
+    import FireObj
+
+    n = len(locs)
+    return FireObj.PixelTable().append(
+        (2020, 7, 1, "AM"),
+        locs[:, 0],
+        locs[:, 1],
+        np.zeros(n),
+        np.zeros(n),
+        np.ones(n),
+        np.ones(n),
+        np.ones(n),
+        np.full(n, "AM"),
+        np.full(n, pd.Timestamp("2020-07-01 02:00")),
+        np.full(n, "SNPP"),
+    )
@@ -0,0 +1,54 @@
+""" Tests for FireClustering
+"""
+import numpy as np
+import pytest
+
+import FireClustering
+import baseline
+
+
+def random_points(n, seed):
+    """ n random projected pixel locations (m), with a density giving clusters of all sizes
+    """
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, 3000 * np.sqrt(n), (n, 2))
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 10, 100, 1000, 3000])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_do_clustering_parity(n, seed):
+    data = list(map(tuple, random_points(n, seed)))
+    assert FireClustering.do_clustering(data, 0.7) == baseline.do_clustering(data, 0.7)
+
+
+@pytest.mark.parametrize("n", [1, 10, 1000, 5000])
+def test_grid_neighbors_match_balltree(n):
+    import pandas as pd
+
+    df = pd.DataFrame(random_points(n, 3), columns=["x", "y"])
+    bptr, binds, bdist = FireClustering.compute_all_spatial_distances(
+        df, 0.7, method="balltree"
+    )
+    gptr, ginds, gdist = FireClustering.compute_all_spatial_distances(
+        df, 0.7, method="grid"
+    )
+    assert np.array_equal(bptr, gptr)
+    for a, b in zip(bptr[:-1], bptr[1:]):
+        bo, go = np.argsort(binds[a:b]), np.argsort(ginds[a:b])
+        assert np.array_equal(binds[a:b][bo], ginds[a:b][go])
+        assert np.allclose(bdist[a:b][bo], gdist[a:b][go])
+
+
+def test_do_clustering_backends_agree():
+    import FireConsts
+
+    data = list(map(tuple, random_points(3000, 4)))
+    nbsearch = FireConsts.nbsearch
+    try:
+        ids = {}
+        for method in ["balltree", "grid"]:
+            FireConsts.nbsearch = method
+            ids[method] = FireClustering.do_clustering(data, 0.7)
+    finally:
+        FireConsts.nbsearch = nbsearch
+    assert ids["balltree"] == ids["grid"]
@@ -0,0 +1,405 @@
+""" Tests for FireObj
+"""
+import copy
+
+import numpy as np
+import pytest
+
+import FireObj
+import FireTime
+from helpers import make_pixels
+
+
+def make_allfires(nfires, t=(2020, 7, 1, "AM"), npix=20, seed=0):
+    """ Allfires with nfires fires of npix pixels around separate centers
+    """
+    rng = np.random.default_rng(seed)
+    centers = np.arange(nfires)[:, None] * [20000.0, 5000.0]
+    locs = np.repeat(centers, npix, axis=0) + rng.normal(scale=300, size=(nfires * npix, 2))
+    allfires = FireObj.Allfires(t)
+    allfires.pixtab = make_pixels(locs).table
+    for fid in range(nfires):
+        pixels = FireObj.Pixels(allfires.pixtab, range(fid * npix, (fid + 1) * npix))
+        allfires.fires[fid] = FireObj.Fire(fid, t, pixels)
+        allfires.pixtab.set_fid(pixels, fid)
+    return allfires
+
+
+def fire_attrs(f):
+    return (
+        f.fireID,
+        f.ti,
+        f.ti_st,
+        f.ti_ed,
+        f.t_inactive,
+        f.status,
+        f.invalid,
+        f.n_pixels,
+        f.n_newpixels,
+        f.locs.tolist(),
+        f.newpixels.frp.tolist(),
+        f.hull.wkb,
+    )
+
+
+@pytest.fixture
+def coldstore(tmp_path, monkeypatch):
+    import FireConsts
+
+    monkeypatch.setattr(FireConsts, "diroutdata", str(tmp_path))
+    return tmp_path
+
+
+def test_evict_getfire_round_trip(coldstore):
+    # fires 0-5 start on 7/1; fire 1 is invalidated, fires 4 and 5 are
+    #   expanded on 7/24, the others are dead by 7/25 and move to the cold store
+    allfires = make_allfires(6)
+    allfires.fires[1].invalid = True
+    allfires.update_status([1])
+    for fid in [4, 5]:
+        allfires.fires[fid].ti_ed = FireTime.t2ti((2020, 7, 24, "AM"))
+    allfires.cleanup((2020, 7, 25, "AM"))
+    memory = copy.deepcopy(allfires)
+
+    allfires.evict_deadfires("REG")
+    assert sorted(allfires.coldfires) == [0, 1, 2, 3]
+    assert sorted(allfires.fires) == [4, 5]
+    for t in [(2020, 7, 25, "AM"), (2020, 7, 25, "PM"), (2020, 8, 3, "AM")]:
+        if t != tuple(allfires.t):
+            allfires.cleanup(t)
+            memory.cleanup(t)
+        assert allfires.fids == memory.fids
+        assert allfires.fids_dead == memory.fids_dead
+        assert allfires.fids_valid == memory.fids_valid
+        for fid in memory.fids:
+            f = allfires.getfire(fid)
+            assert f.ti == allfires.ti
+            assert fire_attrs(f) == fire_attrs(memory.fires[fid])
+        assert [fire_attrs(f) for f in allfires.getfires(allfires.fids)] == [
+            fire_attrs(memory.fires[fid]) for fid in memory.fids
+        ]
+
+
+def test_to_frame_loads_each_cold_file_once(coldstore, monkeypatch):
+    import FireIO
+
+    # dead fires evicted at two time steps (two cold store files)
+    allfires = make_allfires(8)
+    for fid in range(4, 8):
+        allfires.fires[fid].ti_ed = FireTime.t2ti((2020, 7, 3, "AM"))
+    allfires.cleanup((2020, 7, 22, "PM"))
+    allfires.evict_deadfires("REG")
+    allfires.cleanup((2020, 7, 23, "PM"))
+    allfires.evict_deadfires("REG")
+    assert len(set(fnm for fnm, invalid in allfires.coldfires.values())) == 2
+
+    nloads = []
+    load_coldfires = FireIO.load_coldfires
+    monkeypatch.setattr(
+        FireIO, "load_coldfires", lambda fnm: nloads.append(fnm) or load_coldfires(fnm)
+    )
+    allfires._coldcache = {}
+    fids = [0, 4, 1, 5, 2, 6, 3, 7]
+    df = allfires.to_frame(fids, ["t_inactive", "farea", "n_pixels"], hull=True)
+    assert len(nloads) == 2
+    assert list(df.index) == fids
+    assert (df.n_pixels == 20).all()
+    assert list(df.t_inactive) == [22.5, 20.5] * 4
+
+
+def random_firepixels(table, rng, t, n):
+    """ Append n random pixels to table; also return them as a list of FirePixel
+    """
+    cols = [
+        rng.uniform(0, 1e5, n),
+        rng.uniform(0, 1e5, n),
+        rng.uniform(-120, -100, n),
+        rng.uniform(30, 45, n),
+        rng.uniform(0, 100, n),
+        rng.uniform(0.3, 0.8, n),
+        rng.uniform(0.3, 0.8, n),
+        np.full(n, t[-1]),
+        np.datetime64("2020-07-01T00:00", "ns") + rng.integers(0, 24, n) * np.timedelta64(1, "h"),
+        rng.choice(["SNPP", "NOAA20"], n),
+        rng.integers(0, 50, n),
+    ]
+    pixels = table.append(t, *cols)
+    return pixels, [FireObj.FirePixel(*c) for c in zip(*cols)]
+
+
+def pixel_attrs(p):
+    return (p.x, p.y, p.lon, p.lat, p.frp, p.DS, p.DT, p.ampm, p.datetime, p.sat, p.origin)
+
+
+def assert_pixels_equal(pixels, ref):
+    """ Pixels and a list of FirePixel hold the same pixels (by iteration and columns)
+    """
+    assert len(pixels) == len(ref)
+    assert [pixel_attrs(p) for p in pixels] == [pixel_attrs(p) for p in ref]
+    assert pixels.locs.tolist() == [list(p.loc) for p in ref]
+    assert pixels.locs_geo.tolist() == [list(p.loc_geo) for p in ref]
+    for k in ["frp", "DS", "DT", "ampm", "datetime", "sat", "origin"]:
+        assert list(getattr(pixels, k)) == [getattr(p, k) for p in ref]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_pixels_match_firepixel_lists(seed):
+    rng = np.random.default_rng(seed)
+    table = FireObj.PixelTable()
+
+    # sets of pixels built by appending, adding and subsetting, each with the
+    #   list of FirePixel objects the same operations give
+    sets = []
+    for k in range(30):
+        op = rng.integers(4) if len(sets) > 1 else 0
+        if op == 0:  # append to the table
+            t = (2020, 7, 1 + k // 2, ["AM", "PM"][k % 2])
+            sets.append(random_firepixels(table, rng, t, int(rng.integers(0, 300))))
+        elif op == 1:  # add two sets (chunks are linked)
+            (a, ra), (b, rb) = [sets[i] for i in rng.integers(len(sets), size=2)]
+            sets.append((a + b, ra + rb))
+        elif op == 2:  # add to an empty list
+            a, ra = sets[rng.integers(len(sets))]
+            sets.append(([] + a, [] + ra))
+        else:  # subset with a slice or a mask
+            a, ra = sets[rng.integers(len(sets))]
+            if rng.integers(2):
+                i0, i1 = sorted(rng.integers(0, len(a) + 1, size=2))
+                sets.append((a[i0:i1], ra[i0:i1]))
+            else:
+                mask = rng.random(len(a)) < 0.5
+                sets.append((a[mask], [p for p, m in zip(ra, mask) if m]))
+    for pixels, ref in sets:
+        assert_pixels_equal(pixels, ref)
+        if len(ref) > 0:
+            i = int(rng.integers(len(ref)))
+            assert pixel_attrs(pixels[i]) == pixel_attrs(ref[i])
+
+
+def test_pixels_pickle_and_compaction():
+    import pickle
+
+    # fires with chunked pixels (pixels added at several steps) in one table
+    rng = np.random.default_rng(0)
+    allfires = FireObj.Allfires((2020, 7, 1, "AM"))
+    refs = {}
+    for fid in range(5):
+        pixels, ref = random_firepixels(allfires.pixtab, rng, (2020, 7, 1, "AM"), 40)
+        allfires.fires[fid] = FireObj.Fire(fid, (2020, 7, 1, "AM"), pixels)
+        refs[fid] = ref
+    for k in range(1, 4):
+        for fid in range(5):
+            pixels, ref = random_firepixels(allfires.pixtab, rng, (2020, 7, 1 + k, "AM"), 10)
+            f = allfires.fires[fid]
+            f.pixels, f.newpixels = f.pixels + pixels, pixels
+            refs[fid] += ref
+
+    # the pixel index keeps its own copy of the exterior pixel locations (also
+    #   of a view into the table, e.g. the locations of a single range of rows)
+    assert np.shares_memory(pixels.locs, allfires.pixtab.data)
+    allfires.pixidx.update(fid, pixels.locs)
+    assert not np.shares_memory(allfires.pixidx.locs[fid], allfires.pixtab.data)
+    for fid, f in allfires.fires.items():
+        allfires.pixidx.update(fid, f.extlocs)
+
+    # pickling keeps the chunks; compaction (e.g. in active-only pickles)
+    #   moves the pixels of a subset of fires to a new table
+    allfires = pickle.loads(pickle.dumps(allfires))
+    for fid, f in allfires.fires.items():
+        assert_pixels_equal(f.pixels, refs[fid])
+        assert_pixels_equal(f.newpixels, refs[fid][-10:])
+    extlocs = {fid: f.extlocs.copy() for fid, f in allfires.fires.items()}
+    fires = [allfires.fires[fid] for fid in [1, 3]]
+    pixtab = allfires._movepixels(fires)
+    assert pixtab.n == 2 * 70
+    for f in fires:
+        assert f.pixels.table is pixtab
+        assert_pixels_equal(f.pixels, refs[f.fireID])
+        assert_pixels_equal(f.ignpixels, refs[f.fireID][:40])
+        assert np.array_equal(f.extlocs, extlocs[f.fireID])
+    allfires = pickle.loads(pickle.dumps(allfires))
+    for fid, f in allfires.fires.items():
+        assert_pixels_equal(f.pixels, refs[fid])
+        assert np.array_equal(allfires.pixidx.locs[fid], extlocs[fid])
+
+
+def make_afp(t, centers, rng):
+    """ Active fire pixels around centers (list of (x, y, spread, n)) at time step t
+    """
+    import pandas as pd
+
+    locs = np.concatenate(
+        [rng.normal((x, y), spread, size=(n, 2)) for x, y, spread, n in centers]
+    )
+    n = len(locs)
+    dt = pd.Timestamp(*t[:3]) + pd.Timedelta(hours=2 if t[-1] == "AM" else 14)
+    return pd.DataFrame(
+        dict(
+            x=locs[:, 0],
+            y=locs[:, 1],
+            Lon=locs[:, 0] / 1e5 - 120,
+            Lat=locs[:, 1] / 1e5 + 35,
+            FRP=rng.uniform(1, 100, n),
+            DS=np.full(n, 0.4),
+            DT=np.full(n, 0.4),
+            ampm=t[-1],
+            YYYYMMDD_HHMM=pd.Series([dt] * n),
+            Sat=np.full(n, "SNPP"),
+        )
+    )
+
+
+def test_status_sets_match_rescan(monkeypatch):
+    import FireConsts, FireMain
+
+    monkeypatch.setattr(FireConsts, "FTYP_opt", 0)
+    monkeypatch.setattr(FireConsts, "CONT_opt", 0)
+
+    def rescan(allfires):
+        fires = allfires.fires
+        return (
+            sorted(i for i, f in fires.items() if f.isactive),
+            sorted(i for i, f in fires.items() if f.mayreactivate),
+            sorted(i for i, f in fires.items() if not (f.isactive or f.mayreactivate)),
+            sorted(i for i, f in fires.items() if not f.invalid),
+        )
+
+    def check(allfires):
+        assert (
+            allfires.fids_active,
+            allfires.fids_sleeper,
+            allfires.fids_dead,
+            allfires.fids_valid,
+        ) == rescan(allfires)
+
+    # growing fires that burn out at different steps, pairs of fires that grow
+    #   into each other (merges), and small dense fires (invalidated as static)
+    rng = np.random.default_rng(0)
+    t = (2020, 7, 1, "AM")
+    allfires = FireObj.Allfires(t)
+    nmerged, ninvalid = 0, 0
+    for step in range(60):
+        fids_ea = allfires.fids_active
+        allfires.cleanup(t)
+        check(allfires)
+        centers = []
+        for k in range(6):
+            if step < 4 + 4 * k:
+                x = 30000.0 * k
+                centers += [(x, 0, 200 + 150 * step, 20)]
+                centers += [(x + 4000 + 1000 * step, 0, 200, 5)]  # merges into the fire above
+        if step < 30:
+            centers += [(-20000.0, 30000.0, 20, 40)]  # static fire
+        if step % 5 != 4:
+            centers += [(x, 60000, 10, 1) for x in rng.uniform(0, 2e5, 3)]  # isolated pixels
+        if len(centers) > 0:
+            afp = make_afp(t, centers, rng)
+            allfires = FireMain.Fire_expand_rtree(allfires, afp, fids_ea, log=False)
+            check(allfires)
+            fids_ne = allfires.fids_ne
+            fids_ea = sorted(set(fids_ea + allfires.fids_new))
+            if len(fids_ne) > 0:
+                allfires = FireMain.Fire_merge_rtree(
+                    allfires, fids_ne, fids_ea, allfires.fids_sleeper
+                )
+                check(allfires)
+        allfires.invalidate_statfires()
+        check(allfires)
+        nmerged += len(allfires.fids_merged)
+        ninvalid += len(allfires.fids_invalid)
+        t = FireTime.t_nb(t, nb="next")
+
+    # all kinds of changes happened, and sleepers turned into dead fires
+    assert nmerged > 0 and ninvalid > 0
+    assert len(allfires.fids_dead) > ninvalid
+
+
+def test_fireline_cache():
+    import FireVector
+    from FireConsts import fpbuffer
+
+    def fresh(f):
+        """ the fire-line pixel locations and fire line computed without the cache
+        """
+        g = copy.copy(f)
+        g._stepcache = None
+        return g.flplocs.tolist(), g.fline
+
+    # a fire with new pixels inside and around the hull of its first pixels
+    rng = np.random.default_rng(0)
+    allfires = make_allfires(1, npix=300)
+    f = allfires.fires[0]
+    locs = rng.normal(scale=[3000, 1500], size=(200, 2))
+    n = len(locs)
+    nps = allfires.pixtab.append(
+        (2020, 7, 1, "PM"),
+        locs[:, 0],
+        locs[:, 1],
+        *[np.zeros(n)] * 5,
+        np.full(n, "PM"),
+        np.full(n, np.datetime64("2020-07-01T14:00", "ns")),
+        np.full(n, "SNPP"),
+    )
+    f.newpixels = nps
+
+    # computed once per step and equal to the uncached results
+    flinepixels, fline = f.flinepixels, f.fline
+    assert f.flinepixels is flinepixels and f.fline is fline
+    near = FireVector.near_boundary(f.hull, nps.locs, fpbuffer)
+    assert 0 < near.sum() < len(nps)
+    assert flinepixels.locs.tolist() == nps.locs[near].tolist()
+    assert fresh(f) == (flinepixels.locs.tolist(), fline)
+    assert f.fline_prior is fline
+    assert f.n_flinepixels == near.sum() and f.flinelen == fline.length / 1e3
+
+    # a new hull or new pixel set within the step invalidates the cache
+    f.hull = f.hull.buffer(1000)
+    assert f.flinepixels is not flinepixels
+    assert (f.flplocs.tolist(), f.fline) == fresh(f)
+    f.newpixels = nps[:50]
+    assert (f.flplocs.tolist(), f.fline) == fresh(f)
+
+    # cleanup empties the new pixels (no fire line, the prior one is kept)
+    fline_prior = f.fline
+    allfires.cleanup((2020, 7, 2, "AM"))
+    assert len(f.flinepixels) == 0 and f.fline is None and f.flinelen == 0
+    assert f.fline_prior is fline_prior
+
+
+def test_fireattrs_cache():
+    from FireConsts import area_VI
+
+    def expected(f):
+        """ the attributes computed from the hull and pixels (as the original properties)
+        """
+        farea = max(f.hull.area / 1e6, area_VI)
+        frps = [p.frp for p in f.newpixels]
+        return (
+            farea,
+            f.hull.length / 1e3,
+            f.n_pixels / farea,
+            sum(frps) / len(frps) if len(frps) > 0 else 0,
+        )
+
+    def attrs(f):
+        return (f.farea, f.fperim, f.pixden, f.meanFRP)
+
+    rng = np.random.default_rng(0)
+    allfires = make_allfires(4)
+    for f in allfires.fires.values():
+        allfires.pixtab.data["frp"][f.pixels.rows] = rng.uniform(1, 100, f.n_pixels)
+
+    # calculated in one pass (cal_fireattrs) or one fire at a time (properties)
+    allfires.cal_fireattrs([0, 2])
+    for f in allfires.fires.values():
+        assert attrs(f) == pytest.approx(expected(f))
+
+    # a new hull or new pixels within the step invalidate the cached values
+    f = allfires.fires[0]
+    f.hull = f.hull.buffer(500)
+    assert attrs(f) == pytest.approx(expected(f))
+    f.newpixels = f.newpixels[:5]
+    allfires.cal_fireattrs([0])
+    assert attrs(f) == pytest.approx(expected(f))
+    allfires.cleanup((2020, 7, 1, "PM"))
+    assert attrs(f) == pytest.approx(expected(f)) and f.meanFRP == 0
@@ -0,0 +1,106 @@
+""" Tests for the bulk loaded spatial index of fire connecting ranges
+"""
+import numpy as np
+import pytest
+import rtree
+from shapely.geometry import LineString, Point, Polygon
+
+import FireClustering
+
+
+def random_boxes(n, seed, size=30.0):
+    rng = np.random.default_rng(seed)
+    lo = rng.uniform(0, 1000, (n, 2))
+    return np.hstack([lo, lo + rng.uniform(0, size, (n, 2))])
+
+
+def brute_force(bounds, bboxes):
+    """ all (box, item) pairs with intersecting (closed) boxes, sorted by box then item
+    """
+    b, q = np.asarray(bounds), np.asarray(bboxes)
+    hit = (
+        (b[None, :, 0] <= q[:, None, 2])
+        & (b[None, :, 2] >= q[:, None, 0])
+        & (b[None, :, 1] <= q[:, None, 3])
+        & (b[None, :, 3] >= q[:, None, 1])
+    )
+    return np.nonzero(hit)
+
+
+@pytest.mark.parametrize("n", [0, 1, 15, 16, 17, 100, 101, 1000])
+def test_bulk_query_matches_brute_force(n):
+    geoms = [Polygon.from_bounds(*b) for b in random_boxes(n, n)]
+    bboxes = random_boxes(300, n + 1, size=80.0)
+    idx = FireClustering.build_rtree(geoms)
+    iq, ids = FireClustering.idx_intersection_bulk(idx, bboxes)
+    if n == 0:
+        assert len(iq) == 0 and len(ids) == 0
+        return
+    eq, eids = brute_force([g.bounds for g in geoms], bboxes)
+    assert np.array_equal(iq, eq)
+    assert np.array_equal(ids, eids)
+
+
+def test_candidates_in_position_order():
+    # regression: the candidates of each box are sorted by position (the
+    #   first match in fids_ea order wins), also for indexes larger than
+    #   one rtree node, where an incrementally built rtree returns them in
+    #   tree layout order
+    geoms = [Point(500, 500).buffer(10 + i) for i in range(400)]
+    idx = FireClustering.build_rtree(geoms)
+    assert FireClustering.idx_intersection(idx, (495, 495, 505, 505)) == tuple(
+        range(400)
+    )
+
+
+def test_buffers_fids_and_empty_geometries():
+    geoms = [Point(0, 0).buffer(1), Polygon(), Point(10, 0).buffer(1)]
+    idx = FireClustering.build_rtree(geoms, fids=[7, 8, 9], bufs=[5, None, None])
+    assert FireClustering.idx_intersection(idx, (4, -1, 5, 1)) == (7,)
+    assert FireClustering.idx_intersection(idx, (-20, -20, 20, 20)) == (7, 9)
+
+
+def rtree_pairs(geoms, bboxes):
+    """ (box, item) pairs from an incrementally built rtree, sorted by box then item
+    """
+    idx = rtree.index.Index()
+    for ind, geom in enumerate(geoms):
+        if not geom.is_empty:
+            idx.insert(ind, geom.bounds)
+    pairs = sorted((i, j) for i, bbox in enumerate(bboxes) for j in idx.intersection(bbox))
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2).T
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_bulk_query_matches_rtree(seed):
+    # random boxes with empty geometries, points and zero width/height boxes
+    rng = np.random.default_rng(seed)
+    geoms = []
+    for b in random_boxes(int(rng.integers(0, 400)), seed):
+        kind = rng.integers(5)
+        if kind == 0:
+            geoms.append(Polygon())
+        elif kind == 1:
+            geoms.append(Point(b[0], b[1]))
+        elif kind == 2:
+            geoms.append(LineString([(b[0], b[1]), (b[0], b[3])]))
+        else:
+            geoms.append(Polygon.from_bounds(*b))
+    bboxes = [tuple(b) for b in random_boxes(200, seed + 100, size=60.0)]
+    bboxes += [(b[0], b[1], b[0], b[1]) for b in bboxes[:50]]  # point queries
+    bboxes += [g.bounds for g in geoms[:50] if not g.is_empty]  # exact matches
+
+    iq, ids = FireClustering.idx_intersection_bulk(
+        FireClustering.build_rtree(geoms), bboxes
+    )
+    eq, eids = rtree_pairs(geoms, bboxes)
+    assert np.array_equal(iq, eq)
+    assert np.array_equal(ids, eids)
+
+
+def test_empty_index_and_queries():
+    idx = FireClustering.build_rtree([Polygon(), Polygon()])
+    assert FireClustering.idx_intersection(idx, (-1e9, -1e9, 1e9, 1e9)) == ()
+    idx = FireClustering.build_rtree([Point(0, 0)])
+    iq, ids = FireClustering.idx_intersection_bulk(idx, [])
+    assert len(iq) == 0 and len(ids) == 0
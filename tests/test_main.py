@@ -0,0 +1,45 @@
+""" Tests for FireMain
+"""
+import numpy as np
+import pytest
+
+import FireObj
+from helpers import make_pixels
+
+
+@pytest.mark.parametrize("has_fline_prior", [False, True])
+def test_merge_sleeper_fire_line(monkeypatch, has_fline_prior):
+    import FireConsts, FireMain
+
+    monkeypatch.setattr(FireConsts, "FTYP_opt", 0)
+    monkeypatch.setattr(FireConsts, "CONT_opt", 0)
+
+    # a fire detected on 7/1 (a sleeper on 7/8, without new pixels) and a new
+    #   fire on 7/8 within the sleeper range (1 km) of its hull exterior
+    rng = np.random.default_rng(0)
+    locs0 = rng.normal(scale=500, size=(30, 2))
+    locs1 = locs0[:, 0].max() + 700 + rng.normal(scale=50, size=(5, 2))
+    pixels = make_pixels(np.concatenate([locs0, locs1]))
+    allfires = FireObj.Allfires((2020, 7, 1, "AM"))
+    allfires.pixtab = pixels.table
+    allfires.fires[0] = FireObj.Fire(0, (2020, 7, 1, "AM"), pixels[:30])
+    allfires.cleanup((2020, 7, 8, "AM"))
+    allfires.fires[1] = FireObj.Fire(1, (2020, 7, 8, "AM"), pixels[30:])
+    allfires.fids_new = [1]
+    allfires.update_status([1])
+    f0 = allfires.fires[0]
+    assert allfires.fids_sleeper == [0] and f0.fline is None
+    if has_fline_prior:
+        f0.fline_prior = f0.hull.exterior
+
+    allfires = FireMain.Fire_merge_rtree(allfires, [1], [1], [0])
+
+    # a sleeper without any fire line (fline and fline_prior are None) is
+    #   skipped, as in the original loop; otherwise the new fire merges into it
+    if has_fline_prior:
+        assert allfires.heritages == [(1, 0)]
+        assert allfires.fires[1].invalid and f0.n_pixels == 35
+        assert allfires.fids_active == [0]
+    else:
+        assert allfires.heritages == []
+        assert allfires.fids_sleeper == [0] and allfires.fids_active == [1]
@@ -0,0 +1,177 @@
+""" Tests for FireVector
+"""
+import numpy as np
+import pytest
+
+import FireVector
+import baseline
+from helpers import make_pixels
+
+
+@pytest.mark.parametrize("trial", range(24))
+def test_alpha_shape_parity(trial):
+    rng = np.random.default_rng(trial)
+    n = int(rng.integers(4, 2000))
+    pts = rng.normal(size=(n, 2)) * rng.uniform(0.01, 0.3)
+    if trial % 3 == 0:
+        pts = np.round(pts, 2)  # duplicate and collinear points
+    alpha = rng.uniform(0.005, 0.2)
+    points = [tuple(p) for p in pts]
+
+    hull, edge_points = FireVector.alpha_shape(points, alpha)
+    hull0, edge_points0 = baseline.alpha_shape(points, alpha)
+    assert hull.equals(hull0)
+    assert len(edge_points) == len(edge_points0)
+    assert all(np.array_equal(e, e0) for e, e0 in zip(edge_points, edge_points0))
+
+
+def test_alpha_shape_few_points():
+    points = [(0, 0), (1, 0), (0, 1)]
+    assert FireVector.alpha_shape(points, 1).equals(baseline.alpha_shape(points, 1))
+
+
+@pytest.mark.parametrize("n", [1, 2, 10, 1000, 5000])
+def test_cal_extpixels_parity(n):
+    rng = np.random.default_rng(n)
+    fps = make_pixels(rng.normal(size=(n, 2)) * np.sqrt(n) * 200)
+    hull = FireVector.cal_hull(fps.locs)
+
+    ext = FireVector.cal_extpixels(fps, hull)
+    ext0 = baseline.cal_extpixels(fps, hull)
+    locs0 = np.array([p.loc for p in ext0]).reshape(-1, 2)
+    assert np.array_equal(ext.locs.reshape(-1, 2), locs0)
+
+
+def test_rng_intersects_corner():
+    # the buffered range rounds the hull corner with chords (shapely's default
+    #   16 segments per quarter circle), the distance test uses the true circle
+    from shapely.geometry import Point, box
+
+    hull, dist = box(0, 0, 1000, 1000), 375.0
+    rngbuf = FireVector.addbuffer(hull, dist)
+    ang = np.pi / 4 + np.pi / 64  # halfway between two buffer vertices
+    for r, within in [(0.999, True), (1.001, False)]:
+        pt = Point(1000 + r * dist * np.cos(ang), 1000 + r * dist * np.sin(ang))
+        assert FireVector.rng_intersects(hull, pt, dist) == within
+        assert not FireVector.rng_intersects(rngbuf, pt)
+    # both modes agree away from the corners
+    for x, within in [(1000 + 0.999 * dist, True), (1000 + 1.001 * dist, False)]:
+        pt = Point(x, 500)
+        assert FireVector.rng_intersects(hull, pt, dist) == within
+        assert FireVector.rng_intersects(rngbuf, pt) == within
+
+
+def random_hull(rng):
+    """ hull of random fire pixels in a few groups (polygons, multipolygons with
+        parts of 1-2 pixels and thin parts)
+    """
+    groups = []
+    for k in range(int(rng.integers(1, 5))):
+        n = int(rng.choice([1, 2, 3, 10, 200]))
+        c = rng.uniform(0, 20000, 2)
+        if rng.random() < 0.3:  # thin group along a line
+            groups.append(c + np.outer(rng.uniform(0, 3000, n), rng.normal(size=2)))
+        else:
+            groups.append(c + rng.normal(scale=rng.uniform(100, 2000), size=(n, 2)))
+    return FireVector.cal_hull(np.concatenate(groups), "viirs")
+
+
+@pytest.mark.parametrize("trial", range(40))
+def test_near_boundary_matches_buffered_exterior(trial):
+    from types import SimpleNamespace
+    from shapely.geometry import MultiLineString, Point
+
+    rng = np.random.default_rng(trial)
+    hull = random_hull(rng)
+    dist = float(rng.choice([200, 375, 1000]))
+    polys = hull.geoms if hull.type == "MultiPolygon" else [hull]
+    assert hull.type in ["Polygon", "MultiPolygon"]
+
+    # random points around the hull, and points close to the exterior vertices
+    minx, miny, maxx, maxy = hull.bounds
+    locs = rng.uniform(
+        (minx - 2 * dist, miny - 2 * dist), (maxx + 2 * dist, maxy + 2 * dist), (1500, 2)
+    )
+    verts = np.concatenate([np.asarray(p.exterior.coords) for p in polys])
+    locs = np.concatenate([locs, verts + rng.normal(scale=dist, size=verts.shape)])
+
+    near = FireVector.near_boundary(hull, locs, dist)
+    pts = [SimpleNamespace(loc=(x, y), i=i) for i, (x, y) in enumerate(locs)]
+    near0 = np.zeros(len(locs), dtype=bool)
+    near0[[p.i for p in baseline.flinepixels(pts, hull, dist)]] = True
+
+    # the selections differ only where the buffer rounds the exterior vertices
+    #   with chords (points within 0.2% of dist from the edge of the range)
+    exterior = MultiLineString([p.exterior for p in polys])
+    d = np.array([exterior.distance(Point(x, y)) for x, y in locs])
+    differ = near != near0
+    assert (np.abs(d[differ] - dist) < 2e-3 * dist).all()
+    assert near.sum() > 0
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_bound_hull_budget_and_coverage(seed):
+    from shapely import vectorized
+
+    rng = np.random.default_rng(seed)
+    locs = np.concatenate(
+        [
+            rng.normal(rng.uniform(0, 30000, 2), rng.uniform(500, 4000), (int(n), 2))
+            for n in rng.integers(50, 1500, 4)
+        ]
+    )
+    hull = FireVector.cal_hull(locs, "viirs")
+    inhull = vectorized.contains(hull, locs[:, 0], locs[:, 1])
+    for maxvertices in [20, 100, 500]:
+        bounded = FireVector.bound_hull(hull, maxvertices, 1.0)
+        assert bounded.is_valid
+        assert FireVector.count_vertices(bounded) <= maxvertices
+
+        # every pixel the hull covers is still covered
+        assert vectorized.contains(bounded, locs[inhull, 0], locs[inhull, 1]).all()
+        assert hull.difference(bounded).area < 1e-6 * hull.area
+
+    # a hull within the budget is only snapped to the grid
+    bounded = FireVector.bound_hull(hull, 10**6, 1.0)
+    assert FireVector.count_vertices(bounded) <= FireVector.count_vertices(hull)
+    assert bounded.hausdorff_distance(hull) < 1.0
+
+
+def burned_pixels(rng, spacing=375.0, keep=0.8):
+    """ fire pixels on a jittered grid over a burned area of overlapping discs
+    """
+    from shapely import vectorized
+    from shapely.geometry import Point
+    from shapely.ops import unary_union
+
+    area = unary_union(
+        [Point(*rng.uniform(0, 20000, 2)).buffer(rng.uniform(3000, 9000)) for _ in range(3)]
+    )
+    minx, miny, maxx, maxy = area.bounds
+    gx, gy = np.meshgrid(np.arange(minx, maxx, spacing), np.arange(miny, maxy, spacing))
+    locs = np.column_stack([gx.ravel(), gy.ravel()])
+    locs = locs + rng.normal(scale=spacing / 6, size=locs.shape)
+    locs = locs[vectorized.contains(area, locs[:, 0], locs[:, 1])]
+    return locs[rng.random(len(locs)) < keep]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_raster_hull_close_to_alpha_hull(seed):
+    from shapely import vectorized
+
+    rng = np.random.default_rng(seed)
+    locs = burned_pixels(rng)
+    hull = FireVector.cal_hull(locs, "viirs")
+    rhull = FireVector.cal_hull_raster(locs, 375)
+
+    # the bitmap hull covers all pixels; its area is within 10% of the alpha
+    #   shape hull, and the two hulls differ by less than 10% of the area
+    assert vectorized.contains(rhull, locs[:, 0], locs[:, 1]).all()
+    assert rhull.area == pytest.approx(hull.area, rel=0.1)
+    assert hull.symmetric_difference(rhull).area < 0.1 * hull.area
+
+    # painting the pixels in several steps gives the same hull
+    bitmap = None
+    for part in np.array_split(rng.permutation(locs), 5):
+        bitmap = FireVector.paint_cells(bitmap, part, 375)
+    assert FireVector.polygonize_cells(bitmap, 375).equals(rhull)